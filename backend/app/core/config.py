@@ -7,3 +7,175 @@ MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 MINIO_SECURE = os.getenv("MINIO_SECURE") == "true"
+
+# -------------------------
+# Vector DB
+# -------------------------
+VECTOR_DB_DIR = os.getenv("VECTOR_DB_DIR", "data/vector_db")
+
+# Switch a job's index from exact flat search to ANN past this size
+VECTOR_ANN_THRESHOLD = int(os.getenv("VECTOR_ANN_THRESHOLD", "50000"))
+VECTOR_ANN_KIND = os.getenv("VECTOR_ANN_KIND", "ivf")  # ivf | hnsw
+# Retrain once the index has grown by this factor since the last training
+VECTOR_ANN_RETRAIN_GROWTH = float(os.getenv("VECTOR_ANN_RETRAIN_GROWTH", "2.0"))
+VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "16"))
+VECTOR_HNSW_M = int(os.getenv("VECTOR_HNSW_M", "32"))
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "64"))
+# New vectors go to a brute-force "tail" (only they are written to disk) and
+# are folded into the job's index, a full copy + rewrite, once the tail holds
+# more than max(VECTOR_TAIL_MIN_ROWS, VECTOR_TAIL_FRACTION x index size) rows
+VECTOR_TAIL_MIN_ROWS = int(os.getenv("VECTOR_TAIL_MIN_ROWS", "4096"))
+VECTOR_TAIL_FRACTION = float(os.getenv("VECTOR_TAIL_FRACTION", "0.05"))
+
+# -------------------------
+# Embedding cache
+# -------------------------
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite3"
+)
+EMBEDDING_CACHE_MAX_ENTRIES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000")
+)
+
+# Evict job vectors not queried for this many days (0 = never)
+VECTOR_TTL_DAYS = float(os.getenv("VECTOR_TTL_DAYS", "0"))
+# Keep at most this many jobs, least recently used first out (0 = no cap)
+VECTOR_MAX_JOBS = int(os.getenv("VECTOR_MAX_JOBS", "0"))
+VECTOR_EVICTION_INTERVAL_SECONDS = int(
+    os.getenv("VECTOR_EVICTION_INTERVAL_SECONDS", "3600")
+)
+
+# -------------------------
+# OCR
+# -------------------------
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+# Warm Tesseract engines per process (also the parallel OCR thread count)
+OCR_POOL_SIZE = int(os.getenv("OCR_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+# OCR text by image content hash (0 entries = disabled)
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "data/ocr_cache.sqlite3")
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "200000"))
+
+# -------------------------
+# PDF extraction
+# -------------------------
+# Worker processes for page extraction / OCR (1 = serial)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pages per worker task; small ranges balance scanned vs text pages
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+# Shorter documents are extracted in-process
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+# -------------------------
+# Video extraction
+# -------------------------
+# One frame sampled per this many seconds
+VIDEO_FRAME_INTERVAL_SECONDS = float(os.getenv("VIDEO_FRAME_INTERVAL_SECONDS", "5"))
+# Seek instead of grabbing through when the next sample is this far ahead
+VIDEO_SEEK_MIN_GAP_SECONDS = float(os.getenv("VIDEO_SEEK_MIN_GAP_SECONDS", "2"))
+# Mean abs pixel difference (0-255, on a small grayscale thumbnail) below
+# which a frame counts as the same scene as the last OCR'd one
+VIDEO_SCENE_DIFF_THRESHOLD = float(os.getenv("VIDEO_SCENE_DIFF_THRESHOLD", "6"))
+# Cores one video job may keep busy; frame OCR gets VIDEO_OCR_THREADS
+# of them, Whisper the rest (both branches run at once)
+VIDEO_CPU_BUDGET = int(os.getenv("VIDEO_CPU_BUDGET", str(os.cpu_count() or 1)))
+VIDEO_OCR_THREADS = int(
+    os.getenv("VIDEO_OCR_THREADS", str(max(1, VIDEO_CPU_BUDGET // 4)))
+)
+# While a video is processed its chunks are stored every VIDEO_CHUNK_BATCH
+# chunks or VIDEO_CHUNK_FLUSH_SECONDS, whichever comes first (one embedding
+# batch + one append to the job's partition per store)
+VIDEO_CHUNK_BATCH = int(os.getenv("VIDEO_CHUNK_BATCH", "64"))
+VIDEO_CHUNK_FLUSH_SECONDS = float(os.getenv("VIDEO_CHUNK_FLUSH_SECONDS", "30"))
+
+# -------------------------
+# Chat
+# -------------------------
+# Chunks retrieved per chat question (hybrid dense + BM25)
+CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", "5"))
+# Semantic answer cache: a question at least this similar (cosine) to an
+# earlier one on the same job gets its answer
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.92"))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "256"))  # per job
+CHAT_CACHE_MAX_JOBS = int(os.getenv("CHAT_CACHE_MAX_JOBS", "512"))
+
+# Coalesce concurrent query embeddings into one batch
+QUERY_BATCH_WINDOW_MS = float(os.getenv("QUERY_BATCH_WINDOW_MS", "5"))
+QUERY_BATCH_MAX_SIZE = int(os.getenv("QUERY_BATCH_MAX_SIZE", "32"))
+
+# -------------------------
+# LLM
+# -------------------------
+# In-flight generation calls per job (server-wide: LLM_SERVER_SLOTS)
+LLM_MAX_PARALLEL = int(os.getenv("LLM_MAX_PARALLEL", "2"))
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+# Max open connections to Ollama (shared by chat + generation)
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "8"))
+# Overall deadline per LLM call, retries included
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "600"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "3"))
+# Keep the model (and its prompt KV cache) loaded between calls
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+# Calls run against Ollama at once (all jobs + chat);
+# match Ollama's OLLAMA_NUM_PARALLEL
+LLM_SERVER_SLOTS = int(os.getenv("LLM_SERVER_SLOTS", "2"))
+# Slots background generation may never take, kept free for chat
+LLM_INTERACTIVE_RESERVED_SLOTS = int(os.getenv("LLM_INTERACTIVE_RESERVED_SLOTS", "0"))
+# Max waiting calls per priority class before new ones are rejected
+LLM_QUEUE_LIMITS = {
+    "interactive": int(os.getenv("LLM_QUEUE_LIMIT_INTERACTIVE", "32")),
+    "background": int(os.getenv("LLM_QUEUE_LIMIT_BACKGROUND", "256")),
+}
+
+# -------------------------
+# LLM response cache
+# -------------------------
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+# Per-service TTL in seconds (0 = don't cache that service),
+# overridable with LLM_CACHE_TTL_<SERVICE>
+LLM_CACHE_TTL_SECONDS = {
+    service: int(os.getenv(f"LLM_CACHE_TTL_{service.upper()}", default))
+    for service, default in {
+        "summary": str(30 * 86400),
+        "quiz": str(7 * 86400),
+        "concept": str(30 * 86400),
+        "flashcards": str(30 * 86400),
+        "chat": str(86400),
+    }.items()
+}
+
+# -------------------------
+# Prompt context
+# -------------------------
+# HF tokenizer matching the served model (falls back to ~4 chars/token)
+LLM_TOKENIZER = os.getenv("LLM_TOKENIZER", "mistralai/Mistral-7B-Instruct-v0.2")
+# Chunks retrieved before packing into the budget
+CONTEXT_CANDIDATES = int(os.getenv("CONTEXT_CANDIDATES", "12"))
+# Chunks at least this similar (word 3-gram Jaccard) to a kept one are dropped
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.8"))
+# Per-service context budget in tokens, overridable with CONTEXT_TOKENS_<SERVICE>.
+# Quiz / concept / flashcards share one budget so their prompts share one
+# cacheable prefix (see app/llm/prompts.py). "summary" bounds the map-reduce
+# context, which differs from theirs unless SUMMARY_MAP_REDUCE is off.
+CONTEXT_TOKEN_BUDGETS = {
+    service: int(os.getenv(f"CONTEXT_TOKENS_{service.upper()}", default))
+    for service, default in {
+        "summary": "3000",
+        "quiz": "3000",
+        "concept": "3000",
+        "flashcards": "3000",
+        "chat": "1500",
+    }.items()
+}
+
+# -------------------------
+# Summarization
+# -------------------------
+# Summarize the whole job (map-reduce over every chunk) instead of
+# only the retrieved top chunks
+SUMMARY_MAP_REDUCE = os.getenv("SUMMARY_MAP_REDUCE", "true").lower() == "true"
+# Source tokens per map call
+SUMMARY_MAP_TOKENS = int(os.getenv("SUMMARY_MAP_TOKENS", "2500"))
+# Reduce rounds before the remaining summaries are just truncated
+SUMMARY_MAX_LEVELS = int(os.getenv("SUMMARY_MAX_LEVELS", "4"))
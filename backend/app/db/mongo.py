@@ -6,3 +6,5 @@ client = MongoClient(MONGO_URI)
 
 db = client["insightverse_ai"]
 job_results_collection = db["job_results"]
+llm_cache_collection = db["llm_cache"]
+summary_parts_collection = db["summary_parts"]
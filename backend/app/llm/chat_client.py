@@ -1,29 +1,21 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from typing import AsyncIterator
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-CHAT_MODEL = "mistral"
+from app.core.config import OLLAMA_MODEL
+from app.llm import ollama
+from app.llm.response_cache import cached_generate
+from app.llm.scheduler import INTERACTIVE, llm_scheduler
 
-session = requests.Session()
-retries = Retry(
-    total=3,
-    backoff_factor=3,
-    status_forcelist=[500, 502, 503, 504],
-)
-session.mount("http://", HTTPAdapter(max_retries=retries))
+CHAT_MODEL = OLLAMA_MODEL
 
 
-def run_chat_llm(prompt: str) -> str:
-    response = session.post(
-        OLLAMA_URL,
-        json={
-            "model": CHAT_MODEL,
-            "prompt": prompt,
-            "stream": False,
-        },
-        timeout=600
+async def run_chat_llm(prompt: str) -> str:
+    return await cached_generate(
+        prompt, model=CHAT_MODEL, service="chat", priority=INTERACTIVE
     )
 
-    response.raise_for_status()
-    return response.json()["response"]
+
+async def stream_chat_llm(prompt: str) -> AsyncIterator[str]:
+    # The slot is held until the last token (or the client leaves)
+    async with llm_scheduler.slot(INTERACTIVE):
+        async for token in ollama.generate_stream(prompt, model=CHAT_MODEL):
+            yield token
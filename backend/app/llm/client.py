@@ -1,32 +1,46 @@
-# =====================================
-# OLD OLLAMA IMPLEMENTATION (COMMENTED)
-# =====================================
+from typing import Callable, List, Optional
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from app.core.config import OLLAMA_MODEL
+from app.llm.response_cache import cached_generate
+from app.llm.scheduler import BACKGROUND
+from app.llm.structured import generate_items
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL_NAME = "mistral"
+MODEL_NAME = OLLAMA_MODEL
 
-session = requests.Session()
-retries = Retry(
-    total=3,
-    backoff_factor=5,
-    status_forcelist=[500, 502, 503, 504],
-)
-session.mount("http://", HTTPAdapter(max_retries=retries))
 
-def run_llm(prompt: str) -> str:
-    response = session.post(
-        OLLAMA_URL,
-        json={
-            "model": MODEL_NAME,
-            "prompt": prompt,
-            "stream": False,
-        },
-        timeout=600
+async def run_llm(
+    prompt: str,
+    service: str = "generation",
+    use_cache: bool = True,
+    job_id: Optional[str] = None,
+) -> str:
+    return await cached_generate(
+        prompt,
+        model=MODEL_NAME,
+        service=service,
+        use_cache=use_cache,
+        priority=BACKGROUND,
+        job_id=job_id,
     )
-    response.raise_for_status()
-    return response.json()["response"]
 
+
+async def run_llm_items(
+    prompt: str,
+    schema: dict,
+    validate: Callable[[object], bool],
+    count: int,
+    service: str = "generation",
+    use_cache: bool = True,
+    job_id: Optional[str] = None,
+) -> List:
+    return await generate_items(
+        prompt,
+        model=MODEL_NAME,
+        service=service,
+        schema=schema,
+        validate=validate,
+        count=count,
+        use_cache=use_cache,
+        priority=BACKGROUND,
+        job_id=job_id,
+    )
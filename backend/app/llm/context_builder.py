@@ -0,0 +1,163 @@
+import logging
+import threading
+from typing import Dict, List
+
+from app.core.config import (
+    LLM_TOKENIZER,
+    CONTEXT_DEDUP_THRESHOLD,
+    CONTEXT_TOKEN_BUDGETS,
+)
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = "\n\n"
+CHARS_PER_TOKEN = 4
+# Don't bother appending a truncated tail shorter than this
+MIN_TAIL_TOKENS = 64
+
+
+# ===============================
+# TOKENIZER
+# ===============================
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer():
+    """
+    The served model's tokenizer, or None if it can't be
+    loaded (offline, gated repo) -> character estimate
+    """
+    global _tokenizer, _tokenizer_loaded
+
+    if not _tokenizer_loaded:
+        with _tokenizer_lock:
+            if not _tokenizer_loaded:
+                try:
+                    from transformers import AutoTokenizer
+                    _tokenizer = AutoTokenizer.from_pretrained(LLM_TOKENIZER)
+                except Exception as e:
+                    logger.warning(
+                        f"[CONTEXT] Tokenizer {LLM_TOKENIZER} unavailable "
+                        f"({e}), estimating {CHARS_PER_TOKEN} chars/token"
+                    )
+                _tokenizer_loaded = True
+
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    encoded = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True
+    )
+    offsets = encoded["offset_mapping"]
+    if len(offsets) <= max_tokens:
+        return text
+    return text[:offsets[max_tokens - 1][1]]
+
+
+def split_to_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    Consecutive pieces of at most `max_tokens` tokens each,
+    together covering all of `text`
+    """
+    max_tokens = max(1, max_tokens)
+
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        step = max_tokens * CHARS_PER_TOKEN
+        starts = list(range(0, len(text), step))
+    else:
+        offsets = tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True
+        )["offset_mapping"]
+        # Cut where every max_tokens-th token starts
+        starts = [0] + [
+            offsets[i][0] for i in range(max_tokens, len(offsets), max_tokens)
+        ]
+
+    pieces = (
+        text[start:end].strip()
+        for start, end in zip(starts, starts[1:] + [len(text)])
+    )
+    return [piece for piece in pieces if piece]
+
+
+# ===============================
+# NEAR-DUPLICATE DETECTION
+# ===============================
+def shingles(text: str, n: int = 3) -> set:
+    words = text.lower().split()
+    if len(words) < n:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ===============================
+# CONTEXT ASSEMBLY
+# ===============================
+def build_context(docs: List[Dict], service: str) -> str:
+    """
+    Pack retrieved chunks into the service's token budget.
+
+    - `docs` are in relevance order (as returned by search)
+    - Near-duplicate chunks are dropped
+    - Chunks are added in order until the budget is full;
+      the first one that doesn't fit is truncated and
+      packing stops there (never skips ahead), so a smaller
+      budget always yields a prefix of a larger one
+    """
+    budget = CONTEXT_TOKEN_BUDGETS.get(service, CONTEXT_TOKEN_BUDGETS["chat"])
+    separator_tokens = count_tokens(SEPARATOR)
+
+    parts: List[str] = []
+    kept_shingles: List[set] = []
+    used = 0
+
+    for doc in docs:
+        text = doc["text"].strip()
+        if not text:
+            continue
+
+        doc_shingles = shingles(text)
+        if any(
+            jaccard(doc_shingles, kept) >= CONTEXT_DEDUP_THRESHOLD
+            for kept in kept_shingles
+        ):
+            continue
+
+        cost = count_tokens(text) + (separator_tokens if parts else 0)
+
+        if used + cost <= budget:
+            parts.append(text)
+            kept_shingles.append(doc_shingles)
+            used += cost
+            continue
+
+        remaining = budget - used - (separator_tokens if parts else 0)
+        if remaining >= MIN_TAIL_TOKENS or not parts:
+            parts.append(truncate_to_tokens(text, max(remaining, 0)))
+        break
+
+    return SEPARATOR.join(p for p in parts if p)
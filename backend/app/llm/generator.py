@@ -1,51 +1,19 @@
-import json
+import asyncio
 import re
+from app.core.config import LLM_MAX_PARALLEL, CONTEXT_CANDIDATES
 from app.vector_db.client import vector_db
-from app.llm.client import run_llm
+from app.llm.client import run_llm, run_llm_items
+from app.llm.context_builder import build_context
+from app.llm.structured import quiz_schema, valid_quiz_item
+from app.llm.summarizer import summary_context
 from app.llm.prompts import (
     summary_prompt,
     quiz_prompt,
+    concept_prompt,
+    flashcards_prompt,
 )
 
 
-# -------------------------
-# JSON HELPERS (for quiz only)
-# -------------------------
-
-def clean_json_string(raw: str) -> str:
-    raw = re.sub(r"```json|```", "", raw)
-    raw = re.sub(r"//.*", "", raw)
-    raw = re.sub(r",\s*([}\]])", r"\1", raw)
-    return raw.strip()
-
-
-def repair_missing_commas(raw: str) -> str:
-    raw = re.sub(
-        r'("statement"\s*:\s*"[^"]+")\s*\n\s*("answer"\s*:\s*(true|false))',
-        r'\1,\n\2',
-        raw,
-        flags=re.IGNORECASE
-    )
-    return raw
-
-
-def extract_json(llm_output: str):
-    try:
-        return json.loads(llm_output)
-    except Exception:
-        cleaned = clean_json_string(llm_output)
-        cleaned = repair_missing_commas(cleaned)
-        return json.loads(cleaned)
-
-
-def ensure_list(value):
-    if isinstance(value, list):
-        return value
-    if isinstance(value, dict):
-        return [value]
-    return []
-
-
 # -------------------------
 # 🔥 NEW: STICKY NOTES EXTRACTOR
 # -------------------------
@@ -86,63 +54,172 @@ def extract_sticky_notes(raw: str):
 # MAIN GENERATOR
 # -------------------------
 
-def generate_outputs(payload):
+async def generate_outputs(job_id: str, payload, on_result=None):
+    """
+    Every requested service (each summary length, each quiz
+    type, ...) runs as its own task, at most LLM_MAX_PARALLEL
+    at a time. `on_result(path, value)` is awaited as soon as
+    each one finishes, e.g. ("summary", "short").
+    """
     query = payload.query
     services = payload.services
 
-    docs = vector_db.search(query, top_k=5)
-    context = "\n\n".join(d["text"] for d in docs)
+    docs = await asyncio.to_thread(
+        vector_db.search, job_id, query, CONTEXT_CANDIDATES
+    )
+
+    # Each service packs the same ranked chunks into its own token
+    # budget. Packing never skips ahead, so a smaller budget gives a
+    # prefix of a larger one and the prompts still share a KV-cache prefix
+    contexts = {
+        service: await asyncio.to_thread(build_context, docs, service)
+        for service in ("quiz", "concept", "flashcards")
+        if services.get(service)
+    }
+
+    outputs = init_outputs(services)
+    semaphore = asyncio.Semaphore(LLM_MAX_PARALLEL)
+    use_cache = not getattr(payload, "regenerate", False)
+
+    async def llm(prompt: str, service: str) -> str:
+        async with semaphore:
+            return await run_llm(
+                prompt, service=service, use_cache=use_cache, job_id=job_id
+            )
+
+    async def llm_items(prompt: str, service: str, **kwargs) -> list:
+        async with semaphore:
+            return await run_llm_items(
+                prompt,
+                service=service,
+                use_cache=use_cache,
+                job_id=job_id,
+                **kwargs,
+            )
+
+    # Summaries cover the whole job (map-reduce); the context is
+    # built once and shared by every summary length. Its map calls
+    # go through `llm`, so they share the concurrency limit.
+    if services.get("summary"):
+        contexts["summary"] = asyncio.create_task(
+            summary_context(job_id, docs, llm, use_cache)
+        )
+
+    async def run(path, produce):
+        value = await produce()
+
+        target = outputs
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+        if on_result is not None:
+            await on_result(path, value)
+
+    tasks = [
+        asyncio.create_task(run(path, produce))
+        for path, produce in service_tasks(services, contexts, llm, llm_items)
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        if "summary" in contexts:
+            contexts["summary"].cancel()
+        raise
+
+    return outputs
+
 
+def init_outputs(services) -> dict:
+    """
+    Output skeleton, so partial results can be stored
+    under their final keys while others are still running
+    """
     outputs = {}
 
+    if services.get("summary"):
+        outputs["summary"] = {}
+
+    if services.get("quiz") and services["quiz"].get("types"):
+        outputs["quiz"] = {"difficulty": services["quiz"]["difficulty"]}
+
+    if services.get("concept"):
+        outputs["concept"] = {}
+
+    return outputs
+
+
+def service_tasks(services, contexts: dict, llm, llm_items):
+    """
+    Yields (output path, coroutine factory) per LLM call
+    """
+
     # -------------------------
     # SUMMARY
     # -------------------------
     if services.get("summary"):
-        outputs["summary"] = {}
         for summary_type in services["summary"]:
-            prompt = summary_prompt(context, summary_type)
-            outputs["summary"][summary_type] = run_llm(prompt).strip()
+            async def summary(summary_type=summary_type):
+                prompt = summary_prompt(await contexts["summary"], summary_type)
+                return (await llm(prompt, "summary")).strip()
+
+            yield ("summary", summary_type), summary
 
     # -------------------------
-    # QUIZ (STRICT JSON)
+    # QUIZ (SCHEMA-CONSTRAINED JSON)
     # -------------------------
     if services.get("quiz") and services["quiz"].get("types"):
         difficulty = services["quiz"]["difficulty"]
-        outputs["quiz"] = {"difficulty": difficulty}
+        count = services["quiz"].get("count", 10)
 
         for quiz_type in services["quiz"]["types"]:
-            try:
-                prompt = quiz_prompt(context, difficulty, quiz_type)
-                parsed = extract_json(run_llm(prompt))
-                outputs["quiz"][quiz_type] = ensure_list(parsed)
-            except Exception as e:
-                print(f"[WARN] Quiz failed: {quiz_type}", e)
-                outputs["quiz"][quiz_type] = []
+            async def quiz(quiz_type=quiz_type):
+                try:
+                    prompt = quiz_prompt(
+                        contexts["quiz"], difficulty, quiz_type, count
+                    )
+                    return await llm_items(
+                        prompt,
+                        "quiz",
+                        schema=quiz_schema(quiz_type, count),
+                        validate=lambda item: valid_quiz_item(quiz_type, item),
+                        count=count,
+                    )
+                except Exception as e:
+                    print(f"[WARN] Quiz failed: {quiz_type}", e)
+                    return []
+
+            yield ("quiz", quiz_type), quiz
 
     # -------------------------
     # CONCEPT
     # -------------------------
     if services.get("concept"):
-        outputs["concept"] = {}
         for mode in services["concept"]:
-            prompt = concept_prompt(context, mode)
-            outputs["concept"][mode] = run_llm(prompt).strip()
+            async def concept(mode=mode):
+                prompt = concept_prompt(contexts["concept"], mode)
+                return (await llm(prompt, "concept")).strip()
+
+            yield ("concept", mode), concept
 
     # -------------------------
     # 🔥 FLASHCARDS (Sticky Notes – OPTIMISTIC)
     # -------------------------
     if services.get("flashcards") is True:
-        try:
-            prompt = flashcards_prompt(context)
-            llm_response = run_llm(prompt)
+        async def flashcards():
+            try:
+                prompt = flashcards_prompt(contexts["flashcards"])
+                llm_response = await llm(prompt, "flashcards")
 
-            notes = extract_sticky_notes(llm_response)
+                notes = extract_sticky_notes(llm_response)
 
-            outputs["flashcards"] = [{"note": n} for n in notes]
+                return [{"note": n} for n in notes]
 
-        except Exception as e:
-            print("[WARN] Flashcards failed", e)
-            outputs["flashcards"] = []
+            except Exception as e:
+                print("[WARN] Flashcards failed", e)
+                return []
 
-    return outputs
+        yield ("flashcards",), flashcards
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import random
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core.config import (
+    OLLAMA_BASE_URL,
+    LLM_POOL_SIZE,
+    LLM_DEADLINE_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BACKOFF_SECONDS,
+    LLM_KEEP_ALIVE,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERATE_URL = f"{OLLAMA_BASE_URL}/api/generate"
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class LLMDeadlineExceeded(Exception):
+    pass
+
+
+# -------------------------------
+# Shared connection pool
+# -------------------------------
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_POOL_SIZE,
+                max_keepalive_connections=LLM_POOL_SIZE,
+            ),
+            # Per-request read timeouts are bounded by the call deadline
+            timeout=httpx.Timeout(None, connect=10.0),
+        )
+    return _client
+
+
+async def aclose():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _backoff(attempt: int) -> float:
+    # Exponential backoff with full jitter
+    return random.uniform(0, LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+
+# ===============================
+# GENERATE (NON-STREAMING)
+# ===============================
+async def generate(
+    prompt: str,
+    model: str,
+    deadline: float = LLM_DEADLINE_SECONDS,
+    retries: int = LLM_MAX_RETRIES,
+    **fields,
+) -> dict:
+    """
+    POST /api/generate and return Ollama's JSON response.
+
+    - Retries connection errors and 5xx with jittered backoff
+    - `deadline` bounds the whole call, retries included
+    - Cancelling the awaiting task aborts the HTTP request
+    - Extra keyword args are sent as body fields (options, format, ...)
+    """
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline
+    body = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "keep_alive": LLM_KEEP_ALIVE,
+        **fields,
+    }
+
+    for attempt in range(retries + 1):
+        remaining = deadline_at - loop.time()
+        if remaining <= 0:
+            break
+
+        try:
+            response = await asyncio.wait_for(
+                get_client().post(GENERATE_URL, json=body),
+                timeout=remaining,
+            )
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response.json()
+
+            error = httpx.HTTPStatusError(
+                f"Ollama returned {response.status_code}",
+                request=response.request,
+                response=response,
+            )
+
+        except asyncio.TimeoutError:
+            break
+
+        except httpx.TransportError as e:
+            error = e
+
+        if attempt == retries:
+            raise error
+
+        delay = min(_backoff(attempt), max(0.0, deadline_at - loop.time()))
+        logger.warning(
+            f"[LLM] Attempt {attempt + 1} failed ({error}), "
+            f"retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+
+    raise LLMDeadlineExceeded(f"LLM call exceeded {deadline:g}s deadline")
+
+
+# ===============================
+# GENERATE (STREAMING)
+# ===============================
+async def generate_stream(
+    prompt: str,
+    model: str,
+    deadline: float = LLM_DEADLINE_SECONDS,
+    retries: int = LLM_MAX_RETRIES,
+    **fields,
+) -> AsyncIterator[str]:
+    """
+    Yield response tokens as Ollama produces them.
+
+    Failures are only retried before the first token;
+    once text has been handed to the caller it can't be
+    replayed, so later errors propagate.
+    """
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline
+    body = {
+        "model": model,
+        "prompt": prompt,
+        "stream": True,
+        "keep_alive": LLM_KEEP_ALIVE,
+        **fields,
+    }
+
+    for attempt in range(retries + 1):
+        started = False
+
+        try:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+
+            async with get_client().stream(
+                "POST",
+                GENERATE_URL,
+                json=body,
+                timeout=httpx.Timeout(remaining, connect=10.0),
+            ) as response:
+                if response.status_code in RETRY_STATUSES:
+                    raise httpx.HTTPStatusError(
+                        f"Ollama returned {response.status_code}",
+                        request=response.request,
+                        response=response,
+                    )
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    if loop.time() > deadline_at:
+                        raise LLMDeadlineExceeded(
+                            f"LLM stream exceeded {deadline:g}s deadline"
+                        )
+
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+
+                    token = data.get("response", "")
+                    if token:
+                        started = True
+                        yield token
+
+                    if data.get("done"):
+                        return
+
+            return
+
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            retryable = isinstance(e, httpx.TransportError) or (
+                e.response.status_code in RETRY_STATUSES
+            )
+            if started or not retryable or attempt == retries:
+                raise
+
+            delay = min(_backoff(attempt), max(0.0, deadline_at - loop.time()))
+            logger.warning(
+                f"[LLM] Stream attempt {attempt + 1} failed ({e}), "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    raise LLMDeadlineExceeded(f"LLM stream exceeded {deadline:g}s deadline")
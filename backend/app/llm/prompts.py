@@ -1,10 +1,29 @@
-def summary_prompt(context: str, length: str):
-    return f"""
-Generate a {length} summary of the content below.
+# Every generation prompt is:
+#
+#     document_prefix(context)  +  <task-specific suffix>
+#
+# The large CONTENT block comes first. For quiz, concept and
+# flashcards it is the same retrieved context, byte-identical
+# across a job, so Ollama can reuse the KV cache for it and
+# only evaluate the short task suffix. Summaries are built on
+# the map-reduce context (see summarizer.py) and get their own
+# prefix, shared by every summary length.
+# Keep anything service-specific OUT of the prefix.
+
+
+def document_prefix(context: str):
+    return f"""You are a study assistant. Use only the content below.
 
 CONTENT:
 {context}
 
+TASK:
+"""
+
+
+def summary_prompt(context: str, length: str):
+    return document_prefix(context) + f"""Generate a {length} summary of the content above.
+
 OUTPUT RULES:
 - Plain text only
 - No markdown
@@ -13,16 +32,24 @@ OUTPUT RULES:
 """
 
 
+def partial_summary_prompt(context: str):
+    # Map / reduce step of long-document summarization
+    return document_prefix(context) + """Summarize this part of a longer document.
+
+OUTPUT RULES:
+- Plain text only
+- Keep every key concept, definition, name and number
+- No introduction or conclusion
+- At most one short paragraph per topic
+"""
+
+
 def quiz_prompt(context: str, difficulty: str, quiz_type: str, count: int = 10):
     if quiz_type == "short_answer":
-        return f"""
-Generate {count} short-answer questions.
+        return document_prefix(context) + f"""Generate {count} short-answer questions.
 
 Difficulty: {difficulty}
 
-CONTENT:
-{context}
-
 OUTPUT FORMAT (STRICT JSON):
 [
   {{
@@ -38,14 +65,10 @@ RULES:
 """
 
     if quiz_type == "mcq":
-        return f"""
-Generate {count} multiple choice questions.
+        return document_prefix(context) + f"""Generate {count} multiple choice questions.
 
 Difficulty: {difficulty}
 
-CONTENT:
-{context}
-
 OUTPUT FORMAT (STRICT JSON):
 [
   {{
@@ -62,26 +85,49 @@ RULES:
 """
 
     if quiz_type == "true_false":
-      return f"""
-  Generate {count} true/false statements.
-
-  CONTENT:
-  {context}
-
-  OUTPUT FORMAT (STRICT JSON):
-  [
-    {{
-      "statement": "",
-      "answer": true
-    }}
-  ]
-
-  RULES:
-  - Each item must be a clear declarative statement
-  - Do NOT use questions or question marks
-  - No words like what, why, how, when, which
-  - Factual and verifiable from the content
-  - No markdown
-  - No extra text
-  """
+        return document_prefix(context) + f"""Generate {count} true/false statements.
 
+OUTPUT FORMAT (STRICT JSON):
+[
+  {{
+    "statement": "",
+    "answer": true
+  }}
+]
+
+RULES:
+- Each item must be a clear declarative statement
+- Do NOT use questions or question marks
+- No words like what, why, how, when, which
+- Factual and verifiable from the content
+- No markdown
+- No extra text
+"""
+
+
+def concept_prompt(context: str, mode: str):
+    return document_prefix(context) + f"""Explain the key concepts of the content above.
+
+Style: {mode}
+
+OUTPUT RULES:
+- Plain text only
+- No markdown
+- One short paragraph per concept, starting with its name
+- Student-friendly
+"""
+
+
+def flashcards_prompt(context: str):
+    return document_prefix(context) + """Write short revision notes (sticky notes) for the content above.
+
+OUTPUT FORMAT:
+- one note per line, starting with "- "
+
+RULES:
+- 10 to 20 notes
+- Each note is one fact, definition or formula
+- 5 to 20 words per note
+- No markdown
+- No extra text
+"""
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_TTL_SECONDS
+from app.db.mongo import llm_cache_collection
+from app.llm import ollama
+from app.llm.scheduler import INTERACTIVE, llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, fields: dict, prompt: str) -> str:
+    """
+    model + request options + sha256 of the exact prompt
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps(
+        {"model": model, "fields": fields, "prompt": prompt_hash},
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    LLM response cache: in-process LRU in front of a Mongo
+    collection (expired by a TTL index on `expiresAt`).
+    """
+
+    def __init__(self, collection, memory_entries: int):
+        self.collection = collection
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._index_ready = False
+
+        self.memory_hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        # Model time the cache answered for instead of the LLM
+        self.saved_seconds = 0.0
+
+    def _ensure_index(self):
+        if not self._index_ready:
+            self.collection.create_index("expiresAt", expireAfterSeconds=0)
+            self._index_ready = True
+
+    # ---------------------------
+    # MEMORY LAYER
+    # ---------------------------
+    def _memory_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry["expiresAt"] <= datetime.utcnow():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, entry: dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    # ---------------------------
+    # PUBLIC API
+    # ---------------------------
+    def get(self, key: str) -> Optional[str]:
+        entry = self._memory_get(key)
+        if entry is not None:
+            self.memory_hits += 1
+        else:
+            try:
+                self._ensure_index()
+                entry = self.collection.find_one(
+                    {"_id": key, "expiresAt": {"$gt": datetime.utcnow()}}
+                )
+            except Exception:
+                logger.exception("[LLM_CACHE] Lookup failed, treating as miss")
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.mongo_hits += 1
+            self._memory_put(key, entry)
+
+        self.saved_seconds += entry.get("durationSeconds", 0.0)
+        return entry["response"]
+
+    def put(
+        self,
+        key: str,
+        service: str,
+        model: str,
+        response: str,
+        duration_seconds: float,
+    ):
+        ttl = LLM_CACHE_TTL_SECONDS.get(service, 0)
+        if ttl <= 0:
+            return
+
+        entry = {
+            "_id": key,
+            "service": service,
+            "model": model,
+            "response": response,
+            "durationSeconds": duration_seconds,
+            "createdAt": datetime.utcnow(),
+            "expiresAt": datetime.utcnow() + timedelta(seconds=ttl),
+        }
+
+        self._memory_put(key, entry)
+        try:
+            self._ensure_index()
+            self.collection.replace_one({"_id": key}, entry, upsert=True)
+        except Exception:
+            logger.exception("[LLM_CACHE] Failed to persist response")
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.mongo_hits
+        lookups = hits + self.misses
+        return {
+            "memoryEntries": len(self._memory),
+            "memoryHits": self.memory_hits,
+            "mongoHits": self.mongo_hits,
+            "misses": self.misses,
+            "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+            "savedModelSeconds": round(self.saved_seconds, 1),
+        }
+
+
+response_cache = ResponseCache(llm_cache_collection, LLM_CACHE_MEMORY_ENTRIES)
+
+
+async def cached_generate(
+    prompt: str,
+    model: str,
+    service: str,
+    use_cache: bool = True,
+    priority: str = INTERACTIVE,
+    job_id: Optional[str] = None,
+    **fields,
+) -> str:
+    """
+    ollama.generate() behind the response cache.
+    use_cache=False skips the lookup (regenerate) but still
+    refreshes the cached entry with the new answer.
+    Only cache misses take an LLM scheduler slot.
+    """
+    key = cache_key(model, fields, prompt)
+
+    if use_cache:
+        cached = await asyncio.to_thread(response_cache.get, key)
+        if cached is not None:
+            return cached
+
+    started = time.perf_counter()
+    async with llm_scheduler.slot(priority, job_id):
+        response = await ollama.generate(prompt, model=model, **fields)
+
+    # Ollama reports model time in ns; fall back to wall time
+    duration = response.get("total_duration")
+    duration = duration / 1e9 if duration else time.perf_counter() - started
+
+    await asyncio.to_thread(
+        response_cache.put, key, service, model, response["response"], duration
+    )
+    return response["response"]
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    LLM_SERVER_SLOTS,
+    LLM_INTERACTIVE_RESERVED_SLOTS,
+    LLM_QUEUE_LIMITS,
+)
+
+INTERACTIVE = "interactive"   # chat, a user is waiting on it
+BACKGROUND = "background"     # job generation
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+# Recent waits kept per class for the percentiles
+WAIT_SAMPLES = 1000
+
+Waiter = Tuple[asyncio.Future, float]
+
+
+class LLMOverloaded(Exception):
+    pass
+
+
+class LLMScheduler:
+    """
+    Admission + ordering for calls to the (single) Ollama server.
+
+    - At most `slots` calls run at once
+    - Free slots go to INTERACTIVE waiters first
+    - BACKGROUND waiters are served round-robin across jobs,
+      so one large job can't starve the others
+    - `reserved` slots are never used by BACKGROUND calls
+    - A class whose queue is full rejects new calls
+      (LLMOverloaded) instead of queueing them
+
+    Runs on the event loop only; no locking needed.
+    """
+
+    def __init__(self, slots: int, reserved: int, queue_limits: Dict[str, int]):
+        self.slots = max(1, slots)
+        self.reserved = max(0, min(reserved, self.slots - 1))
+        self.queue_limits = queue_limits
+
+        self.active = {priority: 0 for priority in PRIORITIES}
+        self._interactive: Deque[Waiter] = deque()
+        # job_id -> waiters, in round-robin order
+        self._background: "OrderedDict[str, Deque[Waiter]]" = OrderedDict()
+
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.rejected = {priority: 0 for priority in PRIORITIES}
+        self._waits = {
+            priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES
+        }
+
+    # ---------------------------
+    # STATE
+    # ---------------------------
+    def queued(self, priority: str) -> int:
+        if priority == INTERACTIVE:
+            return len(self._interactive)
+        return sum(len(waiters) for waiters in self._background.values())
+
+    def _can_start(self, priority: str) -> bool:
+        if sum(self.active.values()) >= self.slots:
+            return False
+        if priority == BACKGROUND:
+            return self.active[BACKGROUND] < self.slots - self.reserved
+        return True
+
+    # ---------------------------
+    # ACQUIRE / RELEASE
+    # ---------------------------
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE, job_id: Optional[str] = None):
+        await self._acquire(priority, job_id or "")
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: str, job_id: str):
+        # Nothing queued ahead -> start right away
+        ahead = self.queued(INTERACTIVE) + (
+            self.queued(BACKGROUND) if priority == BACKGROUND else 0
+        )
+        if not ahead and self._can_start(priority):
+            self._grant(priority, time.perf_counter())
+            return
+
+        if self.queued(priority) >= self.queue_limits[priority]:
+            self.rejected[priority] += 1
+            raise LLMOverloaded(
+                f"LLM queue full ({self.queue_limits[priority]} {priority} "
+                f"requests waiting), try again later"
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (future, time.perf_counter())
+        if priority == INTERACTIVE:
+            self._interactive.append(waiter)
+        else:
+            self._background.setdefault(job_id, deque()).append(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancel -> hand the slot on
+                self._release(priority)
+            else:
+                self._discard(priority, job_id, waiter)
+            raise
+
+    def _discard(self, priority: str, job_id: str, waiter: Waiter):
+        if priority == INTERACTIVE:
+            if waiter in self._interactive:
+                self._interactive.remove(waiter)
+            return
+
+        waiters = self._background.get(job_id)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._background[job_id]
+
+    def _grant(self, priority: str, enqueued_at: float):
+        self.active[priority] += 1
+        self.admitted[priority] += 1
+        self._waits[priority].append(time.perf_counter() - enqueued_at)
+
+    def _release(self, priority: str):
+        self.active[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._interactive and self._can_start(INTERACTIVE):
+            future, enqueued_at = self._interactive.popleft()
+            if not future.done():
+                self._grant(INTERACTIVE, enqueued_at)
+                future.set_result(None)
+
+        while self._background and self._can_start(BACKGROUND):
+            job_id, waiters = next(iter(self._background.items()))
+            future, enqueued_at = waiters.popleft()
+
+            # Job goes to the back of the rotation
+            del self._background[job_id]
+            if waiters:
+                self._background[job_id] = waiters
+
+            if not future.done():
+                self._grant(BACKGROUND, enqueued_at)
+                future.set_result(None)
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    def stats(self) -> dict:
+        def percentile(priority: str, q: float) -> float:
+            waits_ms = np.array(self._waits[priority] or [0.0]) * 1000
+            return round(float(np.percentile(waits_ms, q)), 2)
+
+        return {
+            "slots": self.slots,
+            "reservedInteractive": self.reserved,
+            "classes": {
+                priority: {
+                    "active": self.active[priority],
+                    "queued": self.queued(priority),
+                    "queueLimit": self.queue_limits[priority],
+                    "admitted": self.admitted[priority],
+                    "rejected": self.rejected[priority],
+                    "waitMsP50": percentile(priority, 50),
+                    "waitMsP99": percentile(priority, 99),
+                }
+                for priority in PRIORITIES
+            },
+            "backgroundJobsWaiting": len(self._background),
+        }
+
+
+llm_scheduler = LLMScheduler(
+    LLM_SERVER_SLOTS, LLM_INTERACTIVE_RESERVED_SLOTS, LLM_QUEUE_LIMITS
+)
@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import (
+    CHAT_CACHE_SIMILARITY,
+    CHAT_CACHE_MAX_ENTRIES,
+    CHAT_CACHE_MAX_JOBS,
+)
+
+
+class JobAnswers:
+    """
+    Question embeddings (unit length, one row each) + answers
+    for one job, at a given content version
+    """
+
+    def __init__(self, version: int, dimension: int):
+        self.version = version
+        self.embeddings = np.empty((0, dimension), dtype="float32")
+        self.answers: List[str] = []
+        self.last_used: List[int] = []
+
+
+class SemanticAnswerCache:
+    """
+    Chat answers keyed by question meaning, scoped to a job.
+
+    A question whose embedding has cosine similarity >=
+    `threshold` with a cached question gets that answer.
+    Entries are dropped as soon as the job's content version
+    changes. Bounded to `max_entries` per job (least recently
+    used first) and `max_jobs` jobs (LRU).
+    """
+
+    def __init__(self, threshold: float, max_entries: int, max_jobs: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, JobAnswers]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype="float32").reshape(-1)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _job(self, job_id: str, version: int) -> Optional[JobAnswers]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.version != version:
+            # Content changed -> every cached answer may be stale
+            del self._jobs[job_id]
+            self.invalidations += 1
+            job = None
+        if job is not None:
+            self._jobs.move_to_end(job_id)
+        return job
+
+    def get(self, job_id: str, version: int, embedding) -> Optional[str]:
+        query = self._normalize(embedding)
+
+        with self._lock:
+            job = self._job(job_id, version)
+            if job is None or not job.answers:
+                self.misses += 1
+                return None
+
+            similarities = job.embeddings @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self._clock += 1
+            job.last_used[best] = self._clock
+            self.hits += 1
+            return job.answers[best]
+
+    def put(self, job_id: str, version: int, embedding, answer: str):
+        query = self._normalize(embedding)
+
+        with self._lock:
+            job = self._job(job_id, version)
+            if job is None:
+                job = JobAnswers(version, query.shape[0])
+                self._jobs[job_id] = job
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+
+            self._clock += 1
+            if len(job.answers) >= self.max_entries:
+                oldest = int(np.argmin(job.last_used))
+                job.embeddings[oldest] = query
+                job.answers[oldest] = answer
+                job.last_used[oldest] = self._clock
+                return
+
+            job.embeddings = np.vstack([job.embeddings, query[None, :]])
+            job.answers.append(answer)
+            job.last_used.append(self._clock)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "jobs": len(self._jobs),
+                "entries": sum(len(job.answers) for job in self._jobs.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+chat_answer_cache = SemanticAnswerCache(
+    CHAT_CACHE_SIMILARITY, CHAT_CACHE_MAX_ENTRIES, CHAT_CACHE_MAX_JOBS
+)
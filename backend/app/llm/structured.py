@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.llm import ollama
+from app.llm.response_cache import cache_key, response_cache
+from app.llm.scheduler import INTERACTIVE, llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================
+# QUIZ SCHEMAS
+# ===============================
+QUIZ_ITEM_SCHEMAS: Dict[str, dict] = {
+    "short_answer": {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "answer": {"type": "string"},
+        },
+        "required": ["question", "answer"],
+    },
+    "mcq": {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "options": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 4,
+                "maxItems": 4,
+            },
+            "answer": {"type": "string"},
+        },
+        "required": ["question", "options", "answer"],
+    },
+    "true_false": {
+        "type": "object",
+        "properties": {
+            "statement": {"type": "string"},
+            "answer": {"type": "boolean"},
+        },
+        "required": ["statement", "answer"],
+    },
+}
+
+
+def quiz_schema(quiz_type: str, count: int) -> dict:
+    """
+    JSON schema sent as Ollama's `format`: a top-level array
+    of quiz items, so the output can be parsed item by item
+    """
+    return {
+        "type": "array",
+        "items": QUIZ_ITEM_SCHEMAS[quiz_type],
+        "minItems": count,
+        "maxItems": count,
+    }
+
+
+def valid_quiz_item(quiz_type: str, item) -> bool:
+    if not isinstance(item, dict):
+        return False
+
+    if quiz_type == "true_false":
+        statement = item.get("statement")
+        return (
+            isinstance(statement, str)
+            and bool(statement.strip())
+            and not statement.rstrip().endswith("?")
+            and isinstance(item.get("answer"), bool)
+        )
+
+    question, answer = item.get("question"), item.get("answer")
+    if not (
+        isinstance(question, str) and question.strip()
+        and isinstance(answer, str) and answer.strip()
+    ):
+        return False
+
+    if quiz_type == "mcq":
+        options = item.get("options")
+        return (
+            isinstance(options, list)
+            and len(options) == 4
+            and all(isinstance(o, str) and o.strip() for o in options)
+            and answer in options
+        )
+
+    return True
+
+
+# ===============================
+# INCREMENTAL PARSER
+# ===============================
+class JsonArrayParser:
+    """
+    Parses a streamed JSON array of objects, returning each
+    object as soon as its closing brace arrives.
+    Anything before the opening '[' (e.g. a ```json fence)
+    is ignored; an object that fails to parse is skipped.
+    """
+
+    def __init__(self):
+        self.in_array = False
+        self.depth = 0          # nesting inside the current item
+        self.in_string = False
+        self.escaped = False
+        self.item: List[str] = []
+        self.invalid = 0
+
+    def feed(self, text: str) -> List:
+        items = []
+
+        for char in text:
+            if not self.in_array:
+                self.in_array = char == "["
+                continue
+
+            if self.depth == 0:
+                if char == "{":
+                    self.depth = 1
+                    self.item = [char]
+                continue
+
+            self.item.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        items.append(json.loads("".join(self.item)))
+                    except ValueError:
+                        self.invalid += 1
+
+        return items
+
+
+# ===============================
+# GENERATION
+# ===============================
+async def generate_items(
+    prompt: str,
+    model: str,
+    service: str,
+    schema: dict,
+    validate: Callable[[object], bool],
+    count: int,
+    use_cache: bool = True,
+    priority: str = INTERACTIVE,
+    job_id: Optional[str] = None,
+) -> List:
+    """
+    Stream schema-constrained output and keep the items that
+    pass `validate`. Generation is stopped as soon as `count`
+    valid items exist; a short stream returns what it has
+    instead of discarding everything.
+    """
+    key = cache_key(model, {"format": schema}, prompt)
+
+    if use_cache:
+        cached = await asyncio.to_thread(response_cache.get, key)
+        if cached is not None:
+            return json.loads(cached)
+
+    started = time.perf_counter()
+    parser = JsonArrayParser()
+    items, rejected = [], 0
+
+    # Closing the stream closes the HTTP response,
+    # which makes Ollama stop generating
+    async with llm_scheduler.slot(priority, job_id):
+        stream = ollama.generate_stream(prompt, model=model, format=schema)
+        try:
+            async for token in stream:
+                for item in parser.feed(token):
+                    if validate(item):
+                        items.append(item)
+                    else:
+                        rejected += 1
+                if len(items) >= count:
+                    break
+        finally:
+            await stream.aclose()
+
+    items = items[:count]
+    if rejected or parser.invalid or len(items) < count:
+        logger.warning(
+            f"[LLM] {service}: {len(items)}/{count} valid items "
+            f"({rejected} rejected, {parser.invalid} unparseable)"
+        )
+
+    # Only complete sets are cached; a short one is retried next time
+    if len(items) == count:
+        await asyncio.to_thread(
+            response_cache.put,
+            key,
+            service,
+            model,
+            json.dumps(items),
+            time.perf_counter() - started,
+        )
+    return items
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, List
+
+from app.core.config import (
+    CONTEXT_TOKEN_BUDGETS,
+    SUMMARY_MAP_REDUCE,
+    SUMMARY_MAP_TOKENS,
+    SUMMARY_MAX_LEVELS,
+)
+from app.llm.client import MODEL_NAME
+from app.llm.context_builder import (
+    SEPARATOR,
+    build_context,
+    count_tokens,
+    split_to_tokens,
+    truncate_to_tokens,
+)
+from app.llm.prompts import partial_summary_prompt
+from app.services.job_repository import get_summary_parts, save_summary_part
+from app.vector_db.client import vector_db
+
+logger = logging.getLogger(__name__)
+
+LLM = Callable[[str, str], Awaitable[str]]
+
+
+# ===============================
+# PACKING
+# ===============================
+def pack(texts: List[str], budget: int) -> List[str]:
+    """
+    Group consecutive texts into blocks of at most `budget`
+    tokens, keeping document order. A single text over the
+    budget (e.g. a whole PDF stored as one chunk) is split
+    into consecutive budget-sized pieces, nothing is dropped.
+    """
+    separator_tokens = count_tokens(SEPARATOR)
+    blocks: List[str] = []
+    current: List[str] = []
+    used = 0
+
+    def pieces(text: str):
+        tokens = count_tokens(text)
+        if tokens <= budget:
+            yield text, tokens
+            return
+        for piece in split_to_tokens(text, budget):
+            yield piece, count_tokens(piece)
+
+    for text in texts:
+        for piece, tokens in pieces(text):
+            cost = tokens + (separator_tokens if current else 0)
+            if current and used + cost > budget:
+                blocks.append(SEPARATOR.join(current))
+                current, used = [], 0
+                cost = tokens
+
+            current.append(piece)
+            used += cost
+
+    if current:
+        blocks.append(SEPARATOR.join(current))
+    return blocks
+
+
+def over_budget(texts: List[str], budget: int) -> bool:
+    return count_tokens(SEPARATOR.join(texts)) > budget
+
+
+def part_key(level: int, block: str) -> str:
+    raw = f"{MODEL_NAME}\0{level}\0{block}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ===============================
+# MAP / REDUCE
+# ===============================
+async def summarize_blocks(
+    job_id: str,
+    blocks: List[str],
+    level: int,
+    llm: LLM,
+    use_cache: bool,
+) -> List[str]:
+    """
+    One summary per block, all blocks in parallel (the
+    `llm` callable enforces the concurrency limit).
+    Finished parts are cached per job by block content, so
+    re-summarizing a job only runs the blocks that changed.
+    """
+    keys = [part_key(level, block) for block in blocks]
+    cached: Dict[str, str] = {}
+    if use_cache:
+        cached = await asyncio.to_thread(get_summary_parts, job_id, keys)
+
+    async def summarize(key: str, block: str) -> str:
+        if key in cached:
+            return cached[key]
+
+        summary = (await llm(partial_summary_prompt(block), "summary")).strip()
+        await asyncio.to_thread(save_summary_part, job_id, key, level, summary)
+        return summary
+
+    summaries = await asyncio.gather(
+        *(summarize(key, block) for key, block in zip(keys, blocks))
+    )
+
+    logger.info(
+        f"[SUMMARY] Job {job_id} level {level} | {len(blocks)} parts "
+        f"({sum(key in cached for key in keys)} cached)"
+    )
+    return [summary for summary in summaries if summary]
+
+
+async def map_reduce_context(job_id: str, llm: LLM, use_cache: bool) -> str:
+    """
+    Summary context covering the whole job:
+
+    - Whole job fits the summary budget -> the chunks themselves
+    - Otherwise chunks are packed into SUMMARY_MAP_TOKENS blocks
+      and summarized (map), then the summaries are packed and
+      summarized again (reduce) until they fit the budget
+
+    Wall-clock time grows with the number of levels
+    (logarithmic in document size), not the number of chunks.
+    Tokenizing a whole job is CPU-heavy, so counting / packing
+    run in a thread like the chunk load.
+    """
+    budget = CONTEXT_TOKEN_BUDGETS["summary"]
+    chunks = await asyncio.to_thread(vector_db.job_chunks, job_id)
+    texts = [chunk["text"].strip() for chunk in chunks if chunk["text"].strip()]
+
+    level = 0
+    while await asyncio.to_thread(over_budget, texts, budget):
+        if level >= SUMMARY_MAX_LEVELS:
+            logger.warning(
+                f"[SUMMARY] Job {job_id} still over budget after "
+                f"{level} levels, truncating"
+            )
+            break
+
+        blocks = await asyncio.to_thread(
+            pack, texts, SUMMARY_MAP_TOKENS if level == 0 else budget
+        )
+        summaries = await summarize_blocks(job_id, blocks, level, llm, use_cache)
+        if not summaries:
+            break
+
+        texts = summaries
+        level += 1
+
+    return await asyncio.to_thread(
+        truncate_to_tokens, SEPARATOR.join(texts), budget
+    )
+
+
+async def summary_context(
+    job_id: str,
+    docs: List[Dict],
+    llm: LLM,
+    use_cache: bool = True,
+) -> str:
+    """
+    Context for summary prompts: map-reduce over the whole job,
+    or the retrieved `docs` when SUMMARY_MAP_REDUCE is off
+    """
+    if not SUMMARY_MAP_REDUCE:
+        return await asyncio.to_thread(build_context, docs, "summary")
+    return await map_reduce_context(job_id, llm, use_cache)
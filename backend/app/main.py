@@ -1,9 +1,15 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.upload import router as upload_router
 from app.routes.ingest import router as ingest_router
 from app.routes.status import router as status_router
 from app.routes.chat import router as chat_router   
+from app.routes.metrics import router as metrics_router
+from app.services.vector_eviction import eviction_enabled, run_eviction_loop
+from app.llm import ollama
+from app.services.extractors.pdf_service import shutdown_pool
 app = FastAPI(
     title="InsightVerse AI Backend",
     version="1.0.0"
@@ -21,6 +27,21 @@ app.include_router(upload_router)
 app.include_router(ingest_router)
 app.include_router(status_router)
 app.include_router(chat_router)
+app.include_router(metrics_router)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if eviction_enabled():
+        asyncio.create_task(run_eviction_loop())
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    await ollama.aclose()
+    shutdown_pool()
+
+
 @app.get("/")
 def health():
     return {"status": "ok"}
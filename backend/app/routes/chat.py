@@ -1,32 +1,77 @@
-from fastapi import APIRouter
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.core.config import CHAT_TOP_K
 from app.vector_db.client import vector_db
-from app.llm.chat_client import run_chat_llm
+from app.llm.chat_client import run_chat_llm, stream_chat_llm
+from app.llm.context_builder import build_context
+from app.llm.scheduler import LLMOverloaded
+from app.llm.semantic_cache import chat_answer_cache
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
+NOT_RELATED_ANSWER = "This question is not related to the content you uploaded."
+
 
 class ChatRequest(BaseModel):
     jobId: str
     question: str
 
 
-@router.post("")
-def chat(payload: ChatRequest):
-    question = payload.question.strip()
+class ChatLookup:
+    """
+    The question embedded once, plus the job's content version;
+    used for the semantic answer cache and for retrieval
+    """
+
+    def __init__(self, job_id: str, question: str):
+        self.job_id = job_id
+        self.question = question
+        self.embedding = None
+        self.version = 0
+
+    async def load(self) -> "ChatLookup":
+        # Threadpool, so concurrent query embeddings still coalesce
+        self.embedding = (
+            await asyncio.to_thread(vector_db.encode_queries, [self.question])
+        )[0]
+        self.version = await asyncio.to_thread(vector_db.job_version, self.job_id)
+        return self
+
+    def cached_answer(self):
+        return chat_answer_cache.get(self.job_id, self.version, self.embedding)
+
+    def store_answer(self, answer: str):
+        if answer:
+            chat_answer_cache.put(
+                self.job_id, self.version, self.embedding, answer
+            )
+
 
-    # 1️⃣ Retrieve context
-    docs = vector_db.search(question, top_k=5)
+async def build_chat_prompt(job_id: str, question: str, embedding=None):
+    """
+    Returns the grounded prompt, or None if nothing relevant was found
+    """
+
+    # 1️⃣ Retrieve context (this job's chunks only, dense + BM25)
+    docs = await asyncio.to_thread(
+        vector_db.hybrid_search,
+        job_id,
+        question,
+        CHAT_TOP_K,
+        query_embedding=embedding,
+    )
 
     if not docs:
-        return {
-            "answer": "This question is not related to the content you uploaded."
-        }
+        return None
 
-    context = "\n\n".join(d["text"] for d in docs)
+    context = await asyncio.to_thread(build_context, docs, "chat")
 
     # 2️⃣ Controlled prompt
-    prompt = f"""
+    return f"""
 You are an AI assistant that answers questions ONLY using the given context.
 
 CONTEXT:
@@ -38,12 +83,93 @@ QUESTION:
 RULES:
 - Answer strictly from the context
 - If the answer is not present, say:
-  "This question is not related to the content you uploaded."
+  "{NOT_RELATED_ANSWER}"
 - Be concise and factual
 """
 
-    answer = run_chat_llm(prompt)
+
+@router.post("")
+async def chat(payload: ChatRequest):
+    question = payload.question.strip()
+
+    # Same question (in other words) already answered for this job?
+    lookup = await ChatLookup(payload.jobId, question).load()
+    cached = lookup.cached_answer()
+    if cached is not None:
+        return {
+            "answer": cached
+        }
+
+    prompt = await build_chat_prompt(payload.jobId, question, lookup.embedding)
+
+    if prompt is None:
+        return {
+            "answer": NOT_RELATED_ANSWER
+        }
+
+    try:
+        answer = await run_chat_llm(prompt)
+    except LLMOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    lookup.store_answer(answer.strip())
 
     return {
         "answer": answer.strip()
     }
+
+
+# ===============================
+# STREAMING (Server-Sent Events)
+# ===============================
+def sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(payload: ChatRequest):
+    """
+    Same answer as POST /api/chat, sent token by token:
+
+        data: {"token": "..."}     (repeated)
+        event: done                (end of answer)
+        event: error               (generation failed)
+    """
+    question = payload.question.strip()
+
+    async def events():
+        try:
+            lookup = await ChatLookup(payload.jobId, question).load()
+            cached = lookup.cached_answer()
+            if cached is not None:
+                yield sse({"token": cached})
+                yield sse({}, event="done")
+                return
+
+            prompt = await build_chat_prompt(
+                payload.jobId, question, lookup.embedding
+            )
+
+            if prompt is None:
+                yield sse({"token": NOT_RELATED_ANSWER})
+            else:
+                tokens = []
+                async for token in stream_chat_llm(prompt):
+                    tokens.append(token)
+                    yield sse({"token": token})
+                lookup.store_answer("".join(tokens).strip())
+
+            yield sse({}, event="done")
+
+        except Exception as e:
+            yield sse({"message": str(e)}, event="error")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # don't let proxies buffer tokens
+        },
+    )
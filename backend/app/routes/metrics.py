@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from app.vector_db.client import vector_db
+from app.llm.response_cache import response_cache
+from app.llm.scheduler import llm_scheduler
+from app.llm.semantic_cache import chat_answer_cache
+from app.services.ocr_cache import ocr_cache
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+# async: runs on the event loop, the only place the LLM
+# scheduler state is touched (a sync def would run in a thread)
+@router.get("")
+async def get_metrics():
+    return {
+        "llmCache": response_cache.stats(),
+        "llmScheduler": llm_scheduler.stats(),
+        "chatAnswerCache": chat_answer_cache.stats(),
+        "ocrCache": ocr_cache.stats(),
+        "embeddingCache": vector_db.embedding_cache.stats(),
+        "queryBatcher": vector_db.query_batcher.stats(),
+    }
@@ -6,6 +6,7 @@ class UploadDataRequest(BaseModel):
     sourceType: str              # FILE | LINK
     services: Dict[str, Any]
     query: Optional[str] = None
+    regenerate: bool = False     # bypass cached LLM outputs
 
     # FILE
     fileType: Optional[str] = None
@@ -1,14 +1,14 @@
+import asyncio
 import logging
 from typing import List
 from io import BytesIO
 from zipfile import ZipFile
 
 from docx import Document
-from PIL import Image
-import pytesseract
 
 from app.vector_db.client import vector_db
 from app.services.minio_service import get_file_bytes
+from app.services.ocr_service import ocr_encoded_images
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +27,13 @@ async def process_docx(job_id: str, payload):
     logger.info(f"[DOCX] Job {job_id} started")
 
     docx_bytes = await load_docx_from_minio(payload.fileUrl)
-    full_text = extract_text_from_docx(docx_bytes)
+    full_text = await asyncio.to_thread(extract_text_from_docx, docx_bytes)
 
     chunks = chunk_text(full_text)
 
-    store_chunks_in_vector_db(
+    # Embedding + index write are blocking -> off the event loop
+    await asyncio.to_thread(
+        store_chunks_in_vector_db,
         job_id=job_id,
         chunks=chunks,
         metadata={
@@ -87,21 +89,19 @@ def extract_text_from_docx(docx_bytes: bytes) -> str:
             extracted_blocks.append(text)
 
     # -----------------------
-    # 2️⃣ OCR images
+    # 2️⃣ OCR images (in parallel on the OCR pool,
+    #    cached by file content; unreadable ones -> "")
     # -----------------------
     with ZipFile(BytesIO(docx_bytes)) as zip_file:
-        for name in zip_file.namelist():
-            if name.startswith("word/media/"):
-                try:
-                    image_bytes = zip_file.read(name)
-                    img = Image.open(BytesIO(image_bytes))
-                    ocr_text = pytesseract.image_to_string(img).strip()
+        images = [
+            zip_file.read(name)
+            for name in zip_file.namelist()
+            if name.startswith("word/media/")
+        ]
 
-                    if ocr_text:
-                        extracted_blocks.append(ocr_text)
-
-                except Exception:
-                    continue  # ignore unreadable images
+    for ocr_text in ocr_encoded_images(images):
+        if ocr_text:
+            extracted_blocks.append(ocr_text)
 
     # -----------------------
     # 3️⃣ Normalize whitespace
@@ -147,4 +147,4 @@ def store_chunks_in_vector_db(
             },
         })
 
-    vector_db.add_documents(records)
+    vector_db.add_documents(job_id, records)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import requests
 from bs4 import BeautifulSoup
@@ -47,17 +48,19 @@ async def process_link(job_id: str, payload):
     logger.info(f"[LINK] Job {job_id} | Type: {link_type} | URL={url}")
 
     if link_type == "website":
-        text = extract_website_text(url)
+        text = await asyncio.to_thread(extract_website_text, url)
 
     elif link_type == "youtube":
-        text = extract_youtube_text(url)
+        text = await asyncio.to_thread(extract_youtube_text, url)
 
     else:
         raise ValueError("Only website and YouTube links are supported")
 
     chunks = chunk_text(text)
 
-    store_in_vector_db(
+    # Embedding + index write are blocking -> off the event loop
+    await asyncio.to_thread(
+        store_in_vector_db,
         job_id=job_id,
         chunks=chunks,
         metadata={
@@ -241,7 +244,7 @@ def store_in_vector_db(
             },
         })
 
-    vector_db.add_documents(records)
+    vector_db.add_documents(job_id, records)
 
 
 # =====================================================
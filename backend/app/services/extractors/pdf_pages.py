@@ -0,0 +1,96 @@
+"""
+Page-level PDF extraction, run in worker processes.
+
+Kept free of heavy imports (vector DB, embedding model): every
+worker process imports this module on start-up.
+"""
+
+import logging
+import os
+from typing import List, Tuple
+
+import fitz  # PyMuPDF
+
+from app.services.ocr_cache import ocr_cache
+from app.services.ocr_service import ocr_buffer
+
+logger = logging.getLogger(__name__)
+
+OCR_DPI = 300
+
+
+def init_worker():
+    """
+    Worker-process initializer. Each worker OCRs one page at
+    a time, so Tesseract's OpenMP threads would only
+    oversubscribe the cores; set before the first engine loads.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def extract_page_range(
+    source, start: int, end: int
+) -> List[Tuple[int, str]]:
+    """
+    Text of pages [start, end) as (page_num, text), OCR for
+    pages without a text layer.
+
+    `source` is a file path (workers open their own document)
+    or the PDF bytes (serial path).
+    """
+    pages = []
+
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+
+    with doc:
+        for page_num in range(start, min(end, doc.page_count)):
+            try:
+                page = doc[page_num]
+                page_text = page.get_text().strip()
+
+                if not page_text:
+                    logger.info(
+                        f"[PDF][OCR] Running OCR on page {page_num + 1}"
+                    )
+                    page_text = ocr_page(page)
+
+                if page_text:
+                    pages.append((page_num, page_text))
+
+            except Exception as e:
+                logger.warning(
+                    f"[PDF] Failed page {page_num + 1}: {e}"
+                )
+
+    return pages
+
+
+def extract_page_range_task(path: str, start: int, end: int):
+    """
+    Worker-process entry point: the pages plus this task's
+    OCR cache (hits, misses), to be added to the parent's metrics
+    """
+    hits, misses = ocr_cache.counters()
+    pages = extract_page_range(path, start, end)
+    after_hits, after_misses = ocr_cache.counters()
+    return pages, (after_hits - hits, after_misses - misses)
+
+
+def ocr_page(page) -> str:
+    """
+    Perform OCR on a single PDF page (grayscale render,
+    pixels handed straight to the OCR engine)
+    """
+
+    pix = page.get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY)
+    return ocr_buffer(
+        pix.samples, pix.width, pix.height, pix.n, pix.stride, dpi=OCR_DPI
+    )
+
+
+def page_count(pdf_bytes: bytes) -> int:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
@@ -1,18 +1,26 @@
-import fitz  # PyMuPDF
+import asyncio
 import logging
-from typing import List
-
-import pytesseract
-from PIL import Image
-
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from app.core.config import (
+    PDF_WORKERS,
+    PDF_PAGES_PER_TASK,
+    PDF_PARALLEL_MIN_PAGES,
+)
 from app.vector_db.client import vector_db
 from app.services.minio_service import get_file_bytes
-
-# -------------------------------
-# Windows: set tesseract path
-# -------------------------------
-pytesseract.pytesseract.tesseract_cmd = (
-    r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+from app.services.ocr_cache import ocr_cache
+from app.services.extractors.pdf_pages import (
+    extract_page_range,
+    extract_page_range_task,
+    init_worker,
+    page_count,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,20 +40,22 @@ async def process_pdf(job_id: str, payload):
     logger.info(f"[PDF] Job {job_id} started")
 
     pdf_bytes = await load_pdf_from_minio(payload.fileUrl)
-    full_text = extract_text_from_pdf(pdf_bytes)
+    full_text = await asyncio.to_thread(extract_text_from_pdf, pdf_bytes)
 
     chunks = chunk_text(full_text)
 
-    store_chunks_in_vector_db(
-    job_id=job_id,
-    chunks=chunks,
-    metadata={
-        "source": "pdf",
-        "fileName": payload.fileUrl.split("/")[-1],
-        "userId": getattr(payload, "userId", None),
-        "sourceType": getattr(payload, "sourceType", "FILE"),
-    },
-)
+    # Embedding + index write are blocking -> off the event loop
+    await asyncio.to_thread(
+        store_chunks_in_vector_db,
+        job_id=job_id,
+        chunks=chunks,
+        metadata={
+            "source": "pdf",
+            "fileName": payload.fileUrl.split("/")[-1],
+            "userId": getattr(payload, "userId", None),
+            "sourceType": getattr(payload, "sourceType", "FILE"),
+        },
+    )
 
 
     logger.info(
@@ -76,33 +86,68 @@ def parse_s3_url(url: str):
 # ===============================
 # PDF TEXT EXTRACTION (OCR SAFE)
 # ===============================
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Shared page-extraction pool. Spawned (not forked) workers,
+    so they don't inherit the model / FAISS threads.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                )
+    return _pool
+
+
+def discard_pool(pool: ProcessPoolExecutor):
+    """
+    Drop a broken pool; the next get_pool() starts a new one
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def extract_text_from_pdf(
+    pdf_bytes: bytes, pool: Optional[ProcessPoolExecutor] = None
+) -> str:
     """
     Extract text from PDF.
     Falls back to OCR for scanned pages.
-    """
 
-    extracted_pages = []
+    Page ranges are spread over the worker pool; each worker
+    opens its own copy of the document. Results are merged
+    back in page order. `pool` defaults to the shared pool.
+    """
 
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page_num, page in enumerate(doc):
-            try:
-                page_text = page.get_text().strip()
+    total_pages = page_count(pdf_bytes)
 
-                if page_text:
-                    extracted_pages.append(page_text)
-                else:
-                    logger.info(
-                        f"[PDF][OCR] Running OCR on page {page_num + 1}"
-                    )
-                    ocr_text = ocr_page(page)
-                    if ocr_text:
-                        extracted_pages.append(ocr_text)
+    if pool is not None:
+        pages = extract_pages_parallel(pdf_bytes, total_pages, pool)
+    elif PDF_WORKERS <= 1 or total_pages < PDF_PARALLEL_MIN_PAGES:
+        pages = extract_page_range(pdf_bytes, 0, total_pages)
+    else:
+        pages = extract_pages_shared_pool(pdf_bytes, total_pages)
 
-            except Exception as e:
-                logger.warning(
-                    f"[PDF] Failed page {page_num + 1}: {e}"
-                )
+    extracted_pages = [text for _, text in sorted(pages)]
 
     # Normalize whitespace
     final_text = "\n\n".join(extracted_pages)
@@ -111,16 +156,54 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     return final_text
 
 
-def ocr_page(page) -> str:
+def extract_pages_shared_pool(pdf_bytes: bytes, total_pages: int):
     """
-    Perform OCR on a single PDF page using Tesseract
+    extract_pages_parallel() on the shared pool. A worker that
+    dies (e.g. a Tesseract crash) breaks the whole pool: it is
+    replaced and the document retried once. Not retried in
+    this process, where the same crash would take the app down.
     """
-
-    pix = page.get_pixmap(dpi=300)
-    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-
-    text = pytesseract.image_to_string(img)
-    return text.strip()
+    for attempt in range(2):
+        pool = get_pool()
+        try:
+            return extract_pages_parallel(pdf_bytes, total_pages, pool)
+        except BrokenProcessPool:
+            discard_pool(pool)
+            if attempt:
+                raise
+            logger.warning("[PDF] Worker process died, retrying on a new pool")
+
+
+def extract_pages_parallel(
+    pdf_bytes: bytes, total_pages: int, pool: ProcessPoolExecutor
+):
+    # Workers read the file instead of each task
+    # pickling a copy of the PDF bytes
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+
+        futures = [
+            pool.submit(
+                extract_page_range_task, path, start, start + PDF_PAGES_PER_TASK
+            )
+            for start in range(0, total_pages, PDF_PAGES_PER_TASK)
+        ]
+
+        pages = []
+        for future in futures:
+            range_pages, (hits, misses) = future.result()
+            pages.extend(range_pages)
+            ocr_cache.record(hits, misses)
+
+        logger.info(
+            f"[PDF] Extracted {total_pages} pages in {len(futures)} ranges"
+        )
+        return pages
+
+    finally:
+        os.remove(path)
 
 
 # ===============================
@@ -164,4 +247,4 @@ def store_chunks_in_vector_db(
             },
         })
 
-    vector_db.add_documents(records)
+    vector_db.add_documents(job_id, records)
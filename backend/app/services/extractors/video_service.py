@@ -1,26 +1,54 @@
+import asyncio
 import logging
 import os
 import tempfile
-from typing import List
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import cv2
-import pytesseract
-from PIL import Image
+import numpy as np
 from moviepy.editor import VideoFileClip
 from faster_whisper import WhisperModel
 
+from app.core.config import (
+    VIDEO_FRAME_INTERVAL_SECONDS,
+    VIDEO_SEEK_MIN_GAP_SECONDS,
+    VIDEO_SCENE_DIFF_THRESHOLD,
+    VIDEO_CPU_BUDGET,
+    VIDEO_OCR_THREADS,
+    VIDEO_CHUNK_BATCH,
+    VIDEO_CHUNK_FLUSH_SECONDS,
+)
 from app.vector_db.client import vector_db
+from app.services.job_repository import update_job_ingest_stats
 from app.services.minio_service import get_file_bytes
+from app.services.ocr_service import ocr_image
 
 logger = logging.getLogger(__name__)
 
+# Frames are compared at this size for scene changes
+SCENE_THUMBNAIL_SIZE = (64, 36)
+
+# -------------------------------
+# CPU budget: frame OCR gets VIDEO_OCR_THREADS (one core
+# each, engines run single-threaded, see ocr_service),
+# Whisper gets the rest, so both branches can run at once
+# -------------------------------
+OCR_THREADS = max(1, min(VIDEO_OCR_THREADS, VIDEO_CPU_BUDGET - 1))
+WHISPER_THREADS = max(1, VIDEO_CPU_BUDGET - OCR_THREADS)
+
 # -------------------------------
 # Whisper model (multilingual → EN)
 # -------------------------------
 whisper_model = WhisperModel(
     "small",
     device="cpu",
-    compute_type="int8"
+    compute_type="int8",
+    cpu_threads=WHISPER_THREADS,
 )
 
 # -------------------------------
@@ -29,16 +57,26 @@ whisper_model = WhisperModel(
 async def process_video(job_id: str, payload):
     """
     1. Load video from MinIO
-    2. Extract audio
-    3. Transcribe + translate to English
-    4. Extract visual text via OCR
-    5. Merge → chunk → store in vector DB
+    2. In parallel:
+       - audio -> transcribe + translate to English
+       - frames -> visual text via OCR
+    3. Each branch chunks its text and stores it in the
+       vector DB as it goes (no merge-at-the-end wait)
     """
 
     logger.info(f"[VIDEO] Job {job_id} started")
 
     video_bytes = await load_video_from_minio(payload.fileUrl)
 
+    metadata = {
+        "source": "video",
+        "fileName": payload.fileUrl.split("/")[-1],
+        "userId": getattr(payload, "userId", None),
+        "sourceType": getattr(payload, "sourceType", "FILE"),
+    }
+    sink = ChunkSink(job_id)
+    started = time.perf_counter()
+
     with tempfile.TemporaryDirectory() as tmpdir:
         video_path = os.path.join(tmpdir, "video.mp4")
         audio_path = os.path.join(tmpdir, "audio.wav")
@@ -47,35 +85,83 @@ async def process_video(job_id: str, payload):
         with open(video_path, "wb") as f:
             f.write(video_bytes)
 
-        # 1️⃣ Extract audio
-        extract_audio(video_path, audio_path)
+        audio_stream = sink.stream({**metadata, "content_type": "audio"})
+        visual_stream = sink.stream({**metadata, "content_type": "visual"})
+
+        # Both branches are CPU-bound native code (CTranslate2,
+        # FFmpeg, Tesseract) that releases the GIL -> threads.
+        # A failed branch can't stop the other thread, so wait for
+        # both before the temp files go away
+        results = await asyncio.gather(
+            asyncio.to_thread(
+                run_branch,
+                "audio",
+                audio_branch,
+                audio_stream,
+                video_path,
+                audio_path,
+            ),
+            asyncio.to_thread(
+                run_branch, "visual", visual_branch, visual_stream, video_path
+            ),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    audio_stats, frame_stats = results
+
+    # Merge: both branches done -> flush what's left
+    await asyncio.to_thread(sink.flush)
+
+    stats = {
+        **frame_stats,
+        **audio_stats,
+        "chunks": sink.stored,
+        "wallSeconds": round(time.perf_counter() - started, 1),
+    }
+    logger.info(f"[VIDEO] Job {job_id} stats | {stats}")
+    await asyncio.to_thread(update_job_ingest_stats, job_id, "video", stats)
 
-        # 2️⃣ Audio → text (any language → English)
-        audio_text = transcribe_audio(audio_path)
+    logger.info(
+        f"[VIDEO] Job {job_id} completed | {sink.stored} chunks stored"
+    )
 
-        # 3️⃣ Visual OCR from frames
-        visual_texts = extract_frames(video_path)
 
-    # 4️⃣ Merge all knowledge
-    full_text = audio_text + " " + " ".join(visual_texts)
+def run_branch(
+    name: str, branch: Callable, stream: "TextStream", *args
+) -> Dict:
+    """
+    Run one branch in a worker thread; its stats get
+    `<name>Seconds` so the two branch times can be compared
+    """
+    started = time.perf_counter()
+    stats = branch(stream, *args)
+    stream.close()
+    stats[f"{name}Seconds"] = round(time.perf_counter() - started, 1)
+    return stats
 
-    chunks = chunk_text(full_text)
 
-    store_chunks_in_vector_db(
-        job_id=job_id,
-        chunks=chunks,
-        metadata={
-            "source": "video",
-            "fileName": payload.fileUrl.split("/")[-1],
-            "userId": getattr(payload, "userId", None),
-            "sourceType": getattr(payload, "sourceType", "FILE"),
-            "content_type": "audio+visual",
-        },
-    )
+def audio_branch(stream: "TextStream", video_path: str, audio_path: str) -> Dict:
+    # 1️⃣ Extract audio
+    if not extract_audio(video_path, audio_path):
+        logger.info("[VIDEO] No audio track, skipping transcription")
+        return {"audioSegments": 0}
 
-    logger.info(
-        f"[VIDEO] Job {job_id} completed | {len(chunks)} chunks stored"
-    )
+    # 2️⃣ Audio → text (any language → English)
+    segments = 0
+    for text in transcribe_audio(audio_path):
+        stream.write(text)
+        segments += 1
+    return {"audioSegments": segments}
+
+
+def visual_branch(stream: "TextStream", video_path: str) -> Dict:
+    # 3️⃣ Visual OCR from frames
+    _, frame_stats = extract_frames(video_path, on_text=stream.write)
+    return frame_stats
 
 
 # ===============================
@@ -101,21 +187,32 @@ def parse_s3_url(url: str):
 # ===============================
 # AUDIO EXTRACTION
 # ===============================
-def extract_audio(video_path: str, audio_path: str):
+def extract_audio(video_path: str, audio_path: str) -> bool:
+    """
+    Write the audio track as 16 kHz WAV; False if there is none
+    """
     clip = VideoFileClip(video_path)
-    clip.audio.write_audiofile(
-        audio_path,
-        codec="pcm_s16le",
-        fps=16000,
-        logger=None
-    )
-    clip.close()
+    try:
+        if clip.audio is None:
+            return False
+        clip.audio.write_audiofile(
+            audio_path,
+            codec="pcm_s16le",
+            fps=16000,
+            logger=None
+        )
+        return True
+    finally:
+        clip.close()
 
 
 # ===============================
 # TRANSCRIPTION (AUTO → ENGLISH)
 # ===============================
-def transcribe_audio(audio_path: str) -> str:
+def transcribe_audio(audio_path: str) -> Iterator[str]:
+    """
+    Yield English segment texts as Whisper decodes them
+    """
     segments, info = whisper_model.transcribe(
         audio_path,
         task="translate",  # 🔥 auto language → English
@@ -124,13 +221,10 @@ def transcribe_audio(audio_path: str) -> str:
 
     logger.info(f"[VIDEO] Detected language: {info.language}")
 
-    texts = [
-        seg.text.strip()
-        for seg in segments
-        if seg.text.strip()
-    ]
-
-    return " ".join(texts)
+    for seg in segments:
+        text = seg.text.strip()
+        if text:
+            yield text
 
 
 # ===============================
@@ -138,36 +232,124 @@ def transcribe_audio(audio_path: str) -> str:
 # ===============================
 def extract_frames(
     video_path: str,
-    every_n_seconds: int = 5
-) -> List[str]:
+    every_n_seconds: float = VIDEO_FRAME_INTERVAL_SECONDS,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> Tuple[List[str], Dict[str, int]]:
+    """
+    OCR one frame every `every_n_seconds`, skipping frames
+    that look the same as the last OCR'd one (static slides).
+    Frames are OCR'd on OCR_THREADS threads while decoding
+    continues; `on_text` gets each text, in frame order.
+
+    Returns (texts, stats) where stats counts frames
+    decoded / sampled / OCR'd / skipped as unchanged.
+    """
     cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
 
     if not fps or fps <= 0:
         fps = 25  # safe fallback
 
-    frame_interval = int(fps * every_n_seconds)
+    stats = {
+        "framesDecoded": 0,
+        "seeks": 0,
+        "framesSampled": 0,
+        "framesOcr": 0,
+        "framesUnchanged": 0,
+    }
 
     texts = []
-    frame_count = 0
+    last_thumbnail = None
+    pending = deque()
+
+    def collect(future):
+        text = future.result()
+        if len(text) > 40:
+            texts.append(text)
+            if on_text is not None:
+                on_text(text)
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=OCR_THREADS, thread_name_prefix="frame-ocr"
+        ) as pool:
+            for frame in sample_frames(cap, fps, every_n_seconds, stats):
+                stats["framesSampled"] += 1
+
+                # Tesseract binarizes anyway -> hand it gray pixels
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                thumbnail = cv2.resize(
+                    gray, SCENE_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA
+                )
+
+                if last_thumbnail is not None and (
+                    scene_difference(thumbnail, last_thumbnail)
+                    < VIDEO_SCENE_DIFF_THRESHOLD
+                ):
+                    stats["framesUnchanged"] += 1
+                    continue
+
+                last_thumbnail = thumbnail
+                stats["framesOcr"] += 1
+                pending.append(pool.submit(ocr_image, gray))
+
+                # Bounded look-ahead keeps decoded frames out of memory
+                while pending and (
+                    len(pending) > 2 * OCR_THREADS or pending[0].done()
+                ):
+                    collect(pending.popleft())
+
+            while pending:
+                collect(pending.popleft())
+    finally:
+        cap.release()
+
+    return texts, stats
+
+
+def sample_frames(
+    cap, fps: float, every_n_seconds: float, stats: Dict[str, int]
+) -> Iterator[np.ndarray]:
+    """
+    Yield the frame at every `every_n_seconds` mark, decoding
+    as little as possible: far-apart targets are reached by
+    seeking, close ones by grab() (no color conversion /
+    copy for the frames in between).
+    """
+    step = max(1, round(fps * every_n_seconds))
+    seek_gap = fps * VIDEO_SEEK_MIN_GAP_SECONDS
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
+    # Unknown length (some streams) -> until read() fails
+    targets = range(0, total, step) if total > 0 else count(0, step)
+    position = 0  # index of the frame read() would return next
 
-        if frame_count % frame_interval == 0:
-            img = Image.fromarray(
-                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            )
-            text = pytesseract.image_to_string(img).strip()
-            if len(text) > 40:
-                texts.append(text)
+    for target in targets:
+        if target - position > seek_gap:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
+            stats["seeks"] += 1
 
-        frame_count += 1
+        while position < target:
+            if not cap.grab():
+                return
+            stats["framesDecoded"] += 1
+            position += 1
 
-    cap.release()
-    return texts
+        ok, frame = cap.read()
+        if not ok:
+            return
+        stats["framesDecoded"] += 1
+        position += 1
+
+        yield frame
+
+
+def scene_difference(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Mean absolute pixel difference (0-255) of two thumbnails
+    """
+    return float(cv2.absdiff(a, b).mean())
 
 
 # ===============================
@@ -182,24 +364,87 @@ def chunk_text(text: str) -> List[str]:
     return sentences
 
 
+class TextStream:
+    """
+    One branch's text as it arrives: complete sentences are
+    chunked right away, the unfinished tail waits for more
+    """
+
+    def __init__(self, sink: "ChunkSink", metadata: dict):
+        self.sink = sink
+        self.metadata = metadata
+        self.buffer = ""
+
+    def write(self, text: str):
+        self.buffer = f"{self.buffer} {text}" if self.buffer else text
+
+        complete, separator, tail = self.buffer.rpartition(". ")
+        if separator:
+            self.buffer = tail
+            self.sink.add(chunk_text(complete), self.metadata)
+
+    def close(self):
+        if self.buffer:
+            self.sink.add(chunk_text(self.buffer), self.metadata)
+            self.buffer = ""
+
+
 # ===============================
 # STORE IN VECTOR DB
 # ===============================
-def store_chunks_in_vector_db(
-    job_id: str,
-    chunks: List[str],
-    metadata: dict,
-):
-    records = []
-
-    for idx, chunk in enumerate(chunks):
-        records.append({
-            "id": f"{job_id}_chunk_{idx}",
-            "text": chunk,
-            "metadata": {
-                **metadata,
-                "chunk_index": idx,
-            },
-        })
-
-    vector_db.add_documents(records)
+class ChunkSink:
+    """
+    Collects chunks from both branches (thread-safe) and
+    stores them in the vector DB every VIDEO_CHUNK_BATCH
+    chunks or VIDEO_CHUNK_FLUSH_SECONDS, so the job is
+    searchable while still processing.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.records: List[dict] = []
+        self.next_index = 0
+        self.stored = 0
+        self._last_store = time.monotonic()
+        self._lock = threading.Lock()
+
+    def stream(self, metadata: dict) -> TextStream:
+        return TextStream(self, metadata)
+
+    def add(self, chunks: List[str], metadata: dict):
+        with self._lock:
+            for chunk in chunks:
+                self.records.append({
+                    "id": f"{self.job_id}_chunk_{self.next_index}",
+                    "text": chunk,
+                    "metadata": {
+                        **metadata,
+                        "chunk_index": self.next_index,
+                    },
+                })
+                self.next_index += 1
+
+            due = (
+                len(self.records) >= VIDEO_CHUNK_BATCH
+                or time.monotonic() - self._last_store
+                >= VIDEO_CHUNK_FLUSH_SECONDS
+            )
+            if not self.records or not due:
+                return
+            batch, self.records = self.records, []
+            self._last_store = time.monotonic()
+
+        self._store(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self.records = self.records, []
+        self._store(batch)
+
+    def _store(self, batch: List[dict]):
+        # Outside the lock: the other branch keeps producing
+        # while this batch is embedded
+        if batch:
+            vector_db.add_documents(self.job_id, batch)
+            with self._lock:
+                self.stored += len(batch)
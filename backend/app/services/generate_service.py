@@ -1,13 +1,28 @@
-from app.llm.generator import generate_outputs
-from app.services.job_repository import update_job_result, mark_job_error
+import asyncio
+from app.llm.generator import generate_outputs, init_outputs
+from app.services.job_repository import (
+    init_job_result,
+    update_job_partial_result,
+    update_job_result,
+    mark_job_error,
+)
 import traceback
 
 
 async def trigger_generation(job_id: str, payload):
     print(f"\n===== LLM GENERATION START | job={job_id} =====")
 
+    async def store_partial(path, value):
+        print(f"[GENERATION] job={job_id} | {'.'.join(path)} ready")
+        await asyncio.to_thread(update_job_partial_result, job_id, path, value)
+
     try:
-        outputs = generate_outputs(payload)
+        # Skeleton first, so partial results have somewhere to go
+        await asyncio.to_thread(
+            init_job_result, job_id, init_outputs(payload.services)
+        )
+
+        outputs = await generate_outputs(job_id, payload, on_result=store_partial)
 
         print("\n----- GENERATED OUTPUT -----")
         for service, result in outputs.items():
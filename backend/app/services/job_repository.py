@@ -1,5 +1,6 @@
 from datetime import datetime
-from app.db.mongo import job_results_collection
+from typing import Dict, List
+from app.db.mongo import job_results_collection, summary_parts_collection
 
 
 def create_job(job_id: str, payload: dict):
@@ -26,6 +27,49 @@ def update_job_result(job_id: str, result: dict):
     )
 
 
+def init_job_result(job_id: str, skeleton: dict):
+    job_results_collection.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "result": skeleton,
+                "updatedAt": datetime.utcnow()
+            }
+        }
+    )
+
+
+def update_job_partial_result(job_id: str, path: tuple, value):
+    """
+    Store one finished service output while the job is
+    still PROCESSING, e.g. path=("summary", "short")
+    """
+    job_results_collection.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "result." + ".".join(path): value,
+                "updatedAt": datetime.utcnow()
+            }
+        }
+    )
+
+
+def update_job_ingest_stats(job_id: str, source: str, stats: dict):
+    """
+    Extraction counters for a job, e.g. source="video"
+    """
+    job_results_collection.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "ingestStats." + source: stats,
+                "updatedAt": datetime.utcnow()
+            }
+        }
+    )
+
+
 def mark_job_error(job_id: str, error: str):
     job_results_collection.update_one(
         {"_id": job_id},
@@ -39,6 +83,49 @@ def mark_job_error(job_id: str, error: str):
     )
 
 
+def mark_job_evicted(job_id: str, reason: str):
+    job_results_collection.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "vectorsEvicted": True,
+                "vectorsEvictedAt": datetime.utcnow(),
+                "evictionReason": reason,
+                "updatedAt": datetime.utcnow()
+            }
+        }
+    )
+
+
+def get_summary_parts(job_id: str, keys: List[str]) -> Dict[str, str]:
+    """
+    Cached intermediate (map / reduce) summaries, by part key
+    """
+    cursor = summary_parts_collection.find(
+        {"jobId": job_id, "key": {"$in": keys}},
+        {"key": 1, "summary": 1},
+    )
+    return {doc["key"]: doc["summary"] for doc in cursor}
+
+
+def save_summary_part(job_id: str, key: str, level: int, summary: str):
+    summary_parts_collection.replace_one(
+        {"_id": f"{job_id}:{key}"},
+        {
+            "jobId": job_id,
+            "key": key,
+            "level": level,
+            "summary": summary,
+            "createdAt": datetime.utcnow()
+        },
+        upsert=True
+    )
+
+
+def delete_summary_parts(job_id: str):
+    summary_parts_collection.delete_many({"jobId": job_id})
+
+
 def get_job(job_id: str):
     job = job_results_collection.find_one({"_id": job_id})
     if job:
@@ -0,0 +1,87 @@
+import hashlib
+import logging
+import sqlite3
+from typing import Optional, Tuple
+
+from app.core.config import OCR_CACHE_PATH, OCR_CACHE_MAX_ENTRIES
+from app.core.disk_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class OCRCache:
+    """
+    Content-addressed OCR text cache.
+
+    key = blake2b(OCR settings + image bytes), where the bytes
+    are either the encoded file (DOCX media) or the raw pixels
+    with their geometry (rendered pages, video frames). Exact
+    hashes only: a near-identical image can read differently.
+
+    Shared by every process (SQLite WAL); hit counters from
+    PDF worker processes are added back with `record()`.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.enabled = max_entries > 0
+        self.store = DiskLRUCache(path, max_entries) if self.enabled else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(settings: str, data, *geometry) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{settings}\0{geometry}\0".encode("utf-8"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            value = self.store.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"[OCR_CACHE] Lookup failed ({e}), treating as miss")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode("utf-8")
+
+    def put(self, key: str, text: str):
+        if not self.enabled:
+            return
+        try:
+            self.store.put(key, text.encode("utf-8"))
+        except sqlite3.Error as e:
+            logger.warning(f"[OCR_CACHE] Store failed ({e})")
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    def counters(self) -> Tuple[int, int]:
+        return self.hits, self.misses
+
+    def record(self, hits: int, misses: int):
+        """
+        Add lookups done in another process
+        """
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        store = self.store.stats() if self.enabled else {}
+        return {
+            "enabled": self.enabled,
+            "entries": store.get("entries", 0),
+            "maxEntries": store.get("maxEntries", 0),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+ocr_cache = OCRCache(OCR_CACHE_PATH, OCR_CACHE_MAX_ENTRIES)
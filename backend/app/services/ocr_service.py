@@ -0,0 +1,247 @@
+"""
+Shared OCR service.
+
+Warm Tesseract engines (tesserocr) are kept in a pool and fed
+raw pixel buffers directly: no tesseract process per image and
+no temp image files. tesserocr links against the Tesseract
+C library; where it can't be installed, OCR falls back to
+pytesseract (one subprocess per call).
+
+Results are cached by image content (see ocr_cache).
+
+Kept free of heavy imports: PDF worker processes import it.
+"""
+
+import importlib.util
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import OCR_LANG, OCR_POOL_SIZE
+from app.services.ocr_cache import ocr_cache
+
+import pytesseract
+
+# tesserocr is optional (pytesseract fallback) and only imported
+# when the first engine starts: its OpenMP runtime reads
+# OMP_THREAD_LIMIT on load, which is set right before (and by
+# PDF workers on start-up, see pdf_pages.init_worker)
+HAS_TESSEROCR = importlib.util.find_spec("tesserocr") is not None
+
+# -------------------------------
+# Windows: set tesseract path
+# -------------------------------
+pytesseract.pytesseract.tesseract_cmd = (
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================
+# ENGINE POOL
+# ===============================
+class OCREnginePool:
+    """
+    Up to `size` tesserocr engines, created on first use and
+    reused. An engine is used by one thread at a time.
+    """
+
+    def __init__(self, size: int, lang: str):
+        self.size = max(1, size)
+        self.lang = lang
+        self._idle: "queue.Queue" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def engine(self):
+        api = self._checkout()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                # Engines already run in parallel threads: stop each
+                # one from also starting an OpenMP thread per core.
+                # setdefault -> an operator's own limit wins
+                os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+                import tesserocr
+
+                logger.info(
+                    f"[OCR] Starting engine {self._created + 1}/{self.size} "
+                    f"(lang={self.lang})"
+                )
+                # Counted only once it exists: a failed start (bad
+                # language / tessdata) must raise every time, not use
+                # up a slot and leave callers waiting on _idle forever
+                api = tesserocr.PyTessBaseAPI(lang=self.lang)
+                self._created += 1
+                return api
+
+        return self._idle.get()
+
+
+_engines = OCREnginePool(OCR_POOL_SIZE, OCR_LANG) if HAS_TESSEROCR else None
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Part of every cache key: a different engine / language reads differently
+SETTINGS = f"{'tesserocr' if HAS_TESSEROCR else 'pytesseract'}|{OCR_LANG}"
+
+if not HAS_TESSEROCR:
+    logger.warning(
+        "[OCR] tesserocr not installed, falling back to pytesseract "
+        "(one tesseract process per image)"
+    )
+
+
+# ===============================
+# RECOGNITION
+# ===============================
+def _recognize(pixels: np.ndarray, dpi: int = 0) -> str:
+    """
+    pixels: contiguous uint8, H x W (gray) or H x W x C (RGB / RGBA)
+    """
+    if _engines is not None:
+        height, width = pixels.shape[:2]
+        channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+        with _engines.engine() as api:
+            api.SetImageBytes(
+                pixels.tobytes(), width, height, channels, pixels.strides[0]
+            )
+            if dpi:
+                api.SetSourceResolution(dpi)
+            return api.GetUTF8Text().strip()
+
+    config = f"--dpi {dpi}" if dpi else ""
+    return pytesseract.image_to_string(
+        Image.fromarray(pixels), lang=OCR_LANG, config=config
+    ).strip()
+
+
+def _cached(key: str, recognize) -> str:
+    text = ocr_cache.get(key)
+    if text is None:
+        text = recognize()
+        ocr_cache.put(key, text)
+    return text
+
+
+# ===============================
+# PUBLIC API
+# ===============================
+def ocr_buffer(
+    data,
+    width: int,
+    height: int,
+    bytes_per_pixel: int,
+    bytes_per_line: Optional[int] = None,
+    dpi: int = 0,
+) -> str:
+    """
+    OCR a raw 8-bit pixel buffer (gray, RGB or RGBA),
+    e.g. a PyMuPDF pixmap's `samples`
+    """
+    bytes_per_line = bytes_per_line or width * bytes_per_pixel
+
+    def recognize():
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, bytes_per_line)
+        pixels = pixels[:, :width * bytes_per_pixel]
+        return ocr_image(pixels.reshape(height, width, bytes_per_pixel), dpi, cache=False)
+
+    key = ocr_cache.key(
+        f"{SETTINGS}|{dpi}", data, width, height, bytes_per_pixel, bytes_per_line
+    )
+    return _cached(key, recognize)
+
+
+def ocr_image(pixels: np.ndarray, dpi: int = 0, cache: bool = True) -> str:
+    """
+    OCR an image array: H x W (gray) or H x W x C (RGB / RGBA), uint8
+    """
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    if pixels.ndim == 3 and pixels.shape[2] == 1:
+        pixels = pixels[:, :, 0]
+
+    if not cache:
+        return _recognize(pixels, dpi)
+
+    key = ocr_cache.key(f"{SETTINGS}|{dpi}", pixels.data, *pixels.shape)
+    return _cached(key, lambda: _recognize(pixels, dpi))
+
+
+def ocr_encoded(image_bytes: bytes) -> str:
+    """
+    OCR an encoded image file (PNG, JPEG, ...), e.g. an
+    embedded DOCX picture. Cached by the file bytes, so a
+    hit skips decoding too.
+    """
+    def recognize():
+        return _recognize(pil_to_pixels(Image.open(BytesIO(image_bytes))))
+
+    return _cached(ocr_cache.key(SETTINGS, image_bytes), recognize)
+
+
+def pil_to_pixels(img: Image.Image) -> np.ndarray:
+    """
+    Decoded PIL image -> pixel array
+    """
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("RGB")
+    return np.ascontiguousarray(np.asarray(img))
+
+
+def ocr_images(images: Iterable[np.ndarray]) -> List[str]:
+    """
+    OCR several image arrays in parallel across the engine
+    pool, results in input order ("" for an image that failed)
+    """
+    return _parallel(ocr_image, images)
+
+
+def ocr_encoded_images(blobs: Iterable[bytes]) -> List[str]:
+    """
+    ocr_images() for encoded image files
+    """
+    return _parallel(ocr_encoded, blobs)
+
+
+def _parallel(ocr, items) -> List[str]:
+    def safe_ocr(item) -> str:
+        try:
+            return ocr(item)
+        except Exception as e:
+            logger.warning(f"[OCR] Failed image: {e}")
+            return ""
+
+    return list(get_executor().map(safe_ocr, items))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, OCR_POOL_SIZE),
+                    thread_name_prefix="ocr",
+                )
+    return _executor
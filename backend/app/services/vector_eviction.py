@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from typing import List
+
+from app.core.config import (
+    VECTOR_TTL_DAYS,
+    VECTOR_MAX_JOBS,
+    VECTOR_EVICTION_INTERVAL_SECONDS,
+)
+from app.vector_db.client import vector_db
+from app.services.job_repository import delete_summary_parts, mark_job_evicted
+
+logger = logging.getLogger(__name__)
+
+
+def eviction_enabled() -> bool:
+    return VECTOR_TTL_DAYS > 0 or VECTOR_MAX_JOBS > 0
+
+
+def evict_idle_jobs() -> List[str]:
+    """
+    1. TTL  -> drop jobs not queried for VECTOR_TTL_DAYS
+    2. LRU  -> drop least recently used jobs above VECTOR_MAX_JOBS
+    """
+    now = time.time()
+    evicted = []
+
+    jobs = sorted(
+        (vector_db.job_last_access(job_id), job_id)
+        for job_id in vector_db.list_jobs()
+    )
+
+    if VECTOR_TTL_DAYS > 0:
+        cutoff = now - VECTOR_TTL_DAYS * 86400
+        while jobs and jobs[0][0] < cutoff:
+            _, job_id = jobs.pop(0)
+            _evict(job_id, f"idle for more than {VECTOR_TTL_DAYS:g} days")
+            evicted.append(job_id)
+
+    if VECTOR_MAX_JOBS > 0:
+        while len(jobs) > VECTOR_MAX_JOBS:
+            _, job_id = jobs.pop(0)
+            _evict(job_id, f"over the {VECTOR_MAX_JOBS}-job limit (LRU)")
+            evicted.append(job_id)
+
+    return evicted
+
+
+def _evict(job_id: str, reason: str):
+    if vector_db.remove_job(job_id):
+        mark_job_evicted(job_id, reason)
+        delete_summary_parts(job_id)
+        logger.info(f"[EVICTION] Job {job_id} evicted | {reason}")
+
+
+async def run_eviction_loop():
+    while True:
+        try:
+            await asyncio.to_thread(evict_idle_jobs)
+        except Exception:
+            logger.exception("[EVICTION] Eviction pass failed")
+
+        await asyncio.sleep(VECTOR_EVICTION_INTERVAL_SECONDS)
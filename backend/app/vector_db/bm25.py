@@ -0,0 +1,104 @@
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Keeps identifiers / acronyms / numbers intact (snake_case, O2, 3NF)
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    In-process inverted index with Okapi BM25 scoring.
+
+    Postings are typed arrays (doc id int32, term freq uint16)
+    and only ever appended to, so adds are incremental.
+    Doc ids are row numbers, aligned with the FAISS index.
+
+    Searches take numpy views of the arrays, and an array
+    can't grow while exported, so add/search share a lock.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self.vocab: Dict[str, int] = {}
+        self.postings_docs: List[array] = []
+        self.postings_tfs: List[array] = []
+        self.doc_len = array("i")
+        self.total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    def add(self, texts: List[str]):
+        with self._lock:
+            self._add(texts)
+
+    def _add(self, texts: List[str]):
+        for text in texts:
+            doc_id = len(self.doc_len)
+            counts = Counter(tokenize(text))
+
+            for term, tf in counts.items():
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    term_id = len(self.postings_docs)
+                    self.vocab[term] = term_id
+                    self.postings_docs.append(array("i"))
+                    self.postings_tfs.append(array("H"))
+
+                self.postings_docs[term_id].append(doc_id)
+                self.postings_tfs[term_id].append(min(tf, 65535))
+
+            length = sum(counts.values())
+            self.doc_len.append(length)
+            self.total_len += length
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            return self._search(query, top_k)
+
+    def _search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        n_docs = len(self.doc_len)
+        if n_docs == 0:
+            return []
+
+        doc_len = np.frombuffer(self.doc_len, dtype=np.int32)
+        avg_len = self.total_len / n_docs or 1.0
+        scores = np.zeros(n_docs, dtype=np.float32)
+
+        for term in set(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+
+            docs = np.frombuffer(self.postings_docs[term_id], dtype=np.int32)
+            tfs = np.frombuffer(
+                self.postings_tfs[term_id], dtype=np.uint16
+            ).astype(np.float32)
+
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_len[docs] / avg_len)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        top_k = min(top_k, n_docs)
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = candidates[np.argsort(-scores[candidates])]
+
+        return [
+            (int(i), float(scores[i]))
+            for i in ranked
+            if scores[i] > 0
+        ]
@@ -1,17 +1,419 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
 import faiss
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional
+
+from app.core.config import (
+    VECTOR_DB_DIR,
+    QUERY_BATCH_WINDOW_MS,
+    QUERY_BATCH_MAX_SIZE,
+)
+from app.vector_db.bm25 import BM25Index
+from app.vector_db.embedding_cache import EmbeddingCache
+from app.vector_db.metadata_store import ChunkStore
+from app.vector_db.query_batcher import QueryEmbeddingBatcher
+from app.vector_db.index_policy import (
+    build_ann_index,
+    configure_search,
+    exact_search,
+    needs_rebuild,
+    tail_limit,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.faiss"
+# Vectors added since index.faiss was written (raw float32 rows);
+# named after the index size it extends, so a tail already folded
+# into the index is never counted twice
+TAIL_FILE = "tail_{}.f32"
+# mtime = last time the job was searched / written
+ACCESS_FILE = "last_access"
+# Don't touch the access marker on every single query
+ACCESS_TOUCH_INTERVAL = 600
+
+# Reciprocal Rank Fusion constant (Cormack et al.)
+RRF_K = 60
+
+# IO_FLAG_MMAP covers IVF inverted lists,
+# IO_FLAG_MMAP_IFC covers flat (IndexFlatCodes) storage
+MMAP_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+MMAP_IFC_FLAGS = MMAP_FLAGS | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+
+
+def read_index_mmap(path: str):
+    try:
+        return faiss.read_index(path, MMAP_IFC_FLAGS)
+    except RuntimeError:
+        # IVF readers reject the IFC flag
+        return faiss.read_index(path, MMAP_FLAGS)
+
+
+def is_tail_file(name: str) -> bool:
+    return name.startswith("tail_") and name.endswith(".f32")
+
+
+def read_tail(path: str, index_size: int, dimension: int) -> Optional[np.ndarray]:
+    try:
+        data = np.fromfile(
+            os.path.join(path, TAIL_FILE.format(index_size)), dtype="float32"
+        )
+    except FileNotFoundError:
+        return None
+
+    # A crash mid-append leaves a partial row -> drop it
+    rows = len(data) // dimension
+    return data[:rows * dimension].reshape(rows, dimension) if rows else None
+
+
+def read_last_access(path: str) -> float:
+    for name in (ACCESS_FILE, INDEX_FILE):
+        try:
+            return os.path.getmtime(os.path.join(path, name))
+        except OSError:
+            continue
+    return 0.0
+
+
+class PartitionRemoved(Exception):
+    """
+    Write to a job partition that was removed (evicted)
+    while the write was in flight
+    """
+
+
+class Snapshot(NamedTuple):
+    """
+    What readers see: an index that is never mutated
+    again, the rows added after it (`tail`, searched by
+    brute force) and how many rows are visible.
+    """
+    index: faiss.Index
+    size: int
+    tail: Optional[np.ndarray] = None
+
+    def search(self, queries: np.ndarray, top_k: int):
+        distances, rows = self.index.search(queries, top_k)
+        if self.tail is None:
+            return distances, rows
+
+        tail_distances, tail_rows = exact_search(self.tail, queries, top_k)
+        distances = np.hstack([distances, tail_distances])
+        rows = np.hstack([rows, tail_rows + self.index.ntotal])
+
+        best = np.argsort(distances, axis=1)[:, :top_k]
+        return (
+            np.take_along_axis(distances, best, axis=1),
+            np.take_along_axis(rows, best, axis=1),
+        )
+
+    def vectors(self, start: int = 0) -> np.ndarray:
+        """
+        Rows [start, size) as one array
+        """
+        base = self.index.ntotal
+        parts = []
+        if start < base:
+            parts.append(self.index.reconstruct_n(start, base - start))
+        if self.tail is not None:
+            parts.append(self.tail[max(0, start - base):])
+        if not parts:
+            return np.empty((0, self.index.d), dtype="float32")
+        return np.concatenate(parts)
+
+
+class JobPartition:
+    """
+    Vectors + metadata for a single job.
+    Searches only ever scan one partition.
+
+    Persisted under VECTOR_DB_DIR/<job_id>/:
+        index.faiss     -> FAISS index (memory-mapped on load)
+        tail_<n>.f32    -> vectors added since, appended per add
+        *.bin / *.json  -> ChunkStore columns (memory-mapped on load)
+
+    Starts as an exact IndexFlatL2 and is rebuilt as an ANN
+    index (IVF / HNSW) in the background once it grows large.
+
+    A BM25 index over the same rows backs lexical search; it is
+    not persisted, but rebuilt from the chunk texts on first use
+    (outside `lock`, so ingest is not blocked while it builds).
+
+    Adds only append to the tail, so an add costs (and writes)
+    its own rows. Once the tail outgrows `tail_limit`, it is
+    folded into a copy of the index.
+
+    Concurrency: writers (ingest, rebuild) serialize on `lock`
+    and never mutate a published index or tail: they build
+    new ones off to the side, then publish them as a new
+    Snapshot in one reference assignment. Readers grab
+    `snapshot` once and never lock. Metadata / BM25 are
+    append-only, so rows past `snapshot.size` are simply not
+    visible yet.
+    """
+
+    def __init__(self, dimension: int, path: str):
+        self.path = path
+        self.snapshot = Snapshot(faiss.IndexFlatL2(dimension), 0)
+        self.metadata_store = ChunkStore()
+        self.mmapped = False
+        self._bm25: Optional[BM25Index] = None
+        self._bm25_lock = threading.Lock()
+
+        self.lock = threading.Lock()
+        self.trained_size = 0
+        self.rebuilding = False
+        # Set by VectorDB.remove_job (under `lock`): writes stop
+        self.removed = False
+
+        # New job = just used; eviction must not see it as idle
+        # while its first ingest is still running
+        self.last_access = time.time()
+        self._last_touch = 0.0
+
+    @classmethod
+    def load(cls, dimension: int, path: str) -> "JobPartition":
+        partition = cls(dimension, path)
+
+        # Read-only mmap: pages are shared across workers and
+        # only faulted in when a search touches them
+        index = read_index_mmap(os.path.join(path, INDEX_FILE))
+        configure_search(index)
+        tail = read_tail(path, index.ntotal, dimension)
+        size = index.ntotal + (0 if tail is None else len(tail))
+        partition.snapshot = Snapshot(index, size, tail)
+        partition.mmapped = True
+        partition.trained_size = index.ntotal
+        partition.last_access = read_last_access(path)
+
+        # Rows beyond the vectors (crash before the vector
+        # write) are ignored -> trust the vectors
+        partition.metadata_store = ChunkStore.load(path, size)
+
+        return partition
+
+    def add(self, embeddings, documents: List[Dict]):
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+
+        with self.lock:
+            if self.removed:
+                raise PartitionRemoved(self.path)
+
+            current = self.snapshot
+            base = current.index.ntotal
+
+            # 1️⃣ Append-only side structures (invisible until publish)
+            self.metadata_store.append(documents)
+            if self._bm25 is not None:
+                self._bm25.add([doc["text"] for doc in documents])
+            self.metadata_store.save_incremental(self.path, current.size)
+
+            if current.size == 0:
+                # index.faiss marks the partition as existing on disk
+                self.save_index(current.index)
+
+            # 2️⃣ New vectors extend the tail; readers keep the old one
+            if current.tail is None:
+                tail = embeddings
+            else:
+                tail = np.concatenate([current.tail, embeddings])
+
+            if len(tail) <= tail_limit(base):
+                # 3️⃣ Persist only the new rows, then publish
+                self.save_tail(base, len(tail) - len(embeddings), embeddings)
+                self.snapshot = Snapshot(current.index, base + len(tail), tail)
+            else:
+                # 3️⃣ Fold the tail into a copy of the index
+                new_index = self._owned_copy(current.index)
+                new_index.add(tail)
+                self.save_index(new_index)
+                self.snapshot = Snapshot(new_index, new_index.ntotal)
+                self.mmapped = False
+
+            if not self.rebuilding and needs_rebuild(
+                self.snapshot.index, self.snapshot.size, self.trained_size
+            ):
+                self.rebuilding = True
+                threading.Thread(
+                    target=self._rebuild, daemon=True
+                ).start()
+
+    def _rebuild(self):
+        """
+        Train a new ANN index off to the side; the current
+        snapshot keeps serving searches until the swap.
+        """
+        try:
+            # Published snapshots are immutable -> no lock needed
+            vectors = self.snapshot.vectors()
+            new_index = build_ann_index(vectors)
+
+            with self.lock:
+                if self.removed:
+                    return
+
+                # Catch up with vectors added while training
+                current = self.snapshot
+                trained_n = len(vectors)
+                if current.size > trained_n:
+                    new_index.add(current.vectors(trained_n))
+
+                self.save_index(new_index)
+                self.snapshot = Snapshot(new_index, current.size)
+                self.trained_size = trained_n
+                self.mmapped = False
+
+            logger.info(
+                f"[VECTOR_DB] Rebuilt {self.path} as "
+                f"{type(new_index).__name__} | {new_index.ntotal} vectors"
+            )
+
+        except Exception:
+            logger.exception(f"[VECTOR_DB] Index rebuild failed: {self.path}")
+
+        finally:
+            self.rebuilding = False
+
+    @property
+    def bm25(self) -> BM25Index:
+        if self._bm25 is None:
+            # Separate lock: concurrent first searches build once,
+            # writers keep going meanwhile
+            with self._bm25_lock:
+                if self._bm25 is None:
+                    self._build_bm25()
+        return self._bm25
+
+    def _build_bm25(self):
+        # Published rows are complete -> tokenize them unlocked
+        built = self.snapshot.size
+        bm25 = BM25Index()
+        store = self.metadata_store
+        bm25.add([store.text(i) for i in range(built)])
+
+        with self.lock:
+            # Catch up with rows added while building; from here
+            # on add() keeps it current
+            bm25.add([store.text(i) for i in range(built, len(store))])
+            self._bm25 = bm25
+
+    def touch(self):
+        """
+        Record an access; persisted (throttled) as the
+        mtime of the access marker for TTL eviction
+        """
+        now = time.time()
+        self.last_access = now
+
+        if now - self._last_touch < ACCESS_TOUCH_INTERVAL:
+            return
+        self._last_touch = now
+
+        try:
+            marker = os.path.join(self.path, ACCESS_FILE)
+            with open(marker, "a"):
+                pass
+            os.utime(marker, (now, now))
+        except OSError:
+            pass  # partition not written yet / being removed
+
+    def _owned_copy(self, index):
+        """
+        Writable copy of a published index
+        """
+        if self.mmapped:
+            # mmapped indexes are read-only, load an owned copy
+            # (clone_index would keep viewing the mapping)
+            index = faiss.read_index(os.path.join(self.path, INDEX_FILE))
+        else:
+            index = faiss.clone_index(index)
+        configure_search(index)
+        return index
+
+    def save_tail(self, index_size: int, start: int, vectors: np.ndarray):
+        os.makedirs(self.path, exist_ok=True)
+        row_bytes = vectors.shape[1] * vectors.itemsize
+
+        with open(os.path.join(self.path, TAIL_FILE.format(index_size)), "ab") as f:
+            # Truncate first: bytes of an interrupted append are overwritten
+            f.truncate(start * row_bytes)
+            f.write(vectors.tobytes())
+
+    def save_index(self, index):
+        """
+        Atomically replace index.faiss with `index`, which
+        holds every row: older tails are obsolete
+        """
+        os.makedirs(self.path, exist_ok=True)
+        index_path = os.path.join(self.path, INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, index_path)
+
+        for name in os.listdir(self.path):
+            if is_tail_file(name):
+                os.remove(os.path.join(self.path, name))
 
 
 class VectorDB:
-    def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, data_dir: str = VECTOR_DB_DIR):
+        self.model_name = "all-MiniLM-L6-v2"
+        self.model = SentenceTransformer(self.model_name)
         self.dimension = 384
+        self.embedding_cache = EmbeddingCache(self.model_name, self.dimension)
+        self.query_batcher = QueryEmbeddingBatcher(
+            self.model.encode,
+            window_ms=QUERY_BATCH_WINDOW_MS,
+            max_batch=QUERY_BATCH_MAX_SIZE,
+        )
+        self.data_dir = data_dir
 
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.metadata_store: List[Dict] = []
+        # job_id -> JobPartition (loaded lazily from disk)
+        self.partitions: Dict[str, JobPartition] = {}
+        self._lock = threading.Lock()
 
-    def add_documents(self, documents: List[Dict]):
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _partition_path(self, job_id: str) -> str:
+        if not job_id or os.path.basename(job_id) != job_id or job_id in (".", ".."):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return os.path.join(self.data_dir, job_id)
+
+    def _get_partition(
+        self, job_id: str, create: bool = False
+    ) -> Optional[JobPartition]:
+        partition = self.partitions.get(job_id)
+        if partition is not None:
+            return partition
+
+        with self._lock:
+            partition = self.partitions.get(job_id)
+            if partition is not None:
+                return partition
+
+            path = self._partition_path(job_id)
+
+            if os.path.exists(os.path.join(path, INDEX_FILE)):
+                partition = JobPartition.load(self.dimension, path)
+                logger.info(
+                    f"[VECTOR_DB] Loaded job {job_id} | "
+                    f"{partition.snapshot.size} vectors (mmap)"
+                )
+            elif create:
+                partition = JobPartition(self.dimension, path)
+            else:
+                return None
+
+            self.partitions[job_id] = partition
+            return partition
+
+    def add_documents(self, job_id: str, documents: List[Dict]):
         """
         documents = [
             {
@@ -25,26 +427,169 @@ class VectorDB:
             return
 
         texts = [doc["text"] for doc in documents]
-        embeddings = self.model.encode(texts)
+        embeddings = self.embedding_cache.encode(self.model, texts)
+
+        partition = self._get_partition(job_id, create=True)
+        partition.add(embeddings, documents)
+        partition.touch()
 
-        self.index.add(embeddings)
-        self.metadata_store.extend(documents)
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        # Single queries (chat) are coalesced with concurrent
+        # callers; explicit batches are already one forward pass
+        if len(queries) == 1 and QUERY_BATCH_WINDOW_MS > 0:
+            return np.stack([self.query_batcher.embed(queries[0])])
+        return self.model.encode(queries)
 
-    def search(self, query: str, top_k: int = 5):
-        if self.index.ntotal == 0:
+    def _dense_rows(
+        self,
+        snapshot: Snapshot,
+        queries: List[str],
+        top_k: int,
+        query_embeddings: Optional[np.ndarray] = None,
+    ) -> List[List[int]]:
+        """
+        One model forward pass + one FAISS search for all queries
+        """
+        if query_embeddings is None:
+            query_embeddings = self.encode_queries(queries)
+        distances, indices = snapshot.search(query_embeddings, top_k)
+
+        # 🔒 CRITICAL SAFETY CHECK
+        return [
+            [int(idx) for idx in row if 0 <= idx < snapshot.size]
+            for row in indices
+        ]
+
+    def search(self, job_id: str, query: str, top_k: int = 5):
+        return self.search_many(job_id, [query], top_k)[0]
+
+    def search_many(
+        self, job_id: str, queries: List[str], top_k: int = 5
+    ) -> List[List[Dict]]:
+        """
+        Batched search: results[i] are the top_k chunks for queries[i]
+        """
+        if not queries:
             return []
 
-        query_embedding = self.model.encode([query])
-        distances, indices = self.index.search(query_embedding, top_k)
+        partition = self._get_partition(job_id)
+        if partition is None:
+            return [[] for _ in queries]
+
+        snapshot = partition.snapshot
+        if snapshot.size == 0:
+            return [[] for _ in queries]
+
+        partition.touch()
+        rows = self._dense_rows(snapshot, queries, top_k)
+
+        return [
+            [partition.metadata_store.get(idx) for idx in row]
+            for row in rows
+        ]
+
+    def hybrid_search(
+        self,
+        job_id: str,
+        query: str,
+        top_k: int = 5,
+        candidates: int = 20,
+        query_embedding: Optional[np.ndarray] = None,
+    ):
+        """
+        Dense (FAISS) + lexical (BM25) retrieval fused with
+        Reciprocal Rank Fusion, so exact-term questions
+        (formula names, acronyms, identifiers) still hit.
+        Pass `query_embedding` if the query is already encoded.
+        """
+        partition = self._get_partition(job_id)
+        if partition is None:
+            return []
+
+        snapshot = partition.snapshot
+        if snapshot.size == 0:
+            return []
+
+        partition.touch()
+        candidates = max(candidates, top_k)
+
+        if query_embedding is not None:
+            query_embedding = np.asarray(query_embedding).reshape(1, -1)
+        dense = self._dense_rows(
+            snapshot, [query], candidates, query_embedding
+        )[0]
+        lexical = [
+            idx
+            for idx, _ in partition.bm25.search(query, candidates)
+            if idx < snapshot.size
+        ]
+
+        fused: Dict[int, float] = {}
+        for ranking in (dense, lexical):
+            for rank, idx in enumerate(ranking):
+                fused[idx] = fused.get(idx, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+        best = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        return [partition.metadata_store.get(idx) for idx in best]
+
+    def job_version(self, job_id: str) -> int:
+        """
+        Changes whenever the job's searchable content does
+        (rows are append-only, so the visible row count)
+        """
+        partition = self._get_partition(job_id)
+        return 0 if partition is None else partition.snapshot.size
+
+    def job_chunks(self, job_id: str) -> List[Dict]:
+        """
+        Every visible chunk of a job, in ingestion order
+        """
+        partition = self._get_partition(job_id)
+        if partition is None:
+            return []
+
+        size = partition.snapshot.size
+        partition.touch()
+        return [partition.metadata_store.get(idx) for idx in range(size)]
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    def list_jobs(self) -> List[str]:
+        jobs = set(self.partitions)
+        for name in os.listdir(self.data_dir):
+            if os.path.exists(os.path.join(self.data_dir, name, INDEX_FILE)):
+                jobs.add(name)
+        return sorted(jobs)
+
+    def job_last_access(self, job_id: str) -> float:
+        partition = self.partitions.get(job_id)
+        if partition is not None:
+            return partition.last_access
+        # Not loaded -> don't mmap it just to read a timestamp
+        return read_last_access(self._partition_path(job_id))
+
+    def remove_job(self, job_id: str) -> bool:
+        """
+        Drop a job's vectors + metadata from memory and disk.
+        In-flight searches keep their reference and finish normally;
+        an in-flight add finishes first, later ones raise
+        PartitionRemoved instead of recreating the files.
+        """
+        path = self._partition_path(job_id)
 
-        results = []
+        with self._lock:
+            partition = self.partitions.pop(job_id, None)
+            existed = partition is not None or os.path.isdir(path)
 
-        for idx in indices[0]:
-            # 🔒 CRITICAL SAFETY CHECK
-            if 0 <= idx < len(self.metadata_store):
-                results.append(self.metadata_store[idx])
+            if partition is not None:
+                with partition.lock:
+                    partition.removed = True
+            shutil.rmtree(path, ignore_errors=True)
 
-        return results
+        if existed:
+            logger.info(f"[VECTOR_DB] Removed job {job_id}")
+        return existed
 
 
 # ✅ SHARED INSTANCE (singleton)
@@ -0,0 +1,65 @@
+import hashlib
+from typing import List
+
+import numpy as np
+
+from app.core.config import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+from app.core.disk_cache import DiskLRUCache
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+
+    key = sha256(model name + normalized chunk text)
+    Only cache misses are sent to the SentenceTransformer.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dimension: int,
+        path: str = EMBEDDING_CACHE_PATH,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.store = DiskLRUCache(path, max_entries)
+
+    def key(self, text: str) -> str:
+        raw = f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def encode(self, model, texts: List[str]) -> np.ndarray:
+        keys = [self.key(t) for t in texts]
+        cached = self.store.get_many(list(dict.fromkeys(keys)))
+
+        # Encode each distinct missing chunk once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            fresh = np.asarray(
+                model.encode(list(missing.values())), dtype="float32"
+            )
+            new_items = [
+                (key, vec.tobytes())
+                for key, vec in zip(missing.keys(), fresh)
+            ]
+            self.store.put_many(new_items)
+            cached.update(new_items)
+
+        embeddings = np.empty((len(texts), self.dimension), dtype="float32")
+        for i, key in enumerate(keys):
+            embeddings[i] = np.frombuffer(cached[key], dtype="float32")
+
+        return embeddings
+
+    def stats(self):
+        return self.store.stats()
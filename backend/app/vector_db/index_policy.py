@@ -0,0 +1,131 @@
+import math
+
+import faiss
+import numpy as np
+
+from app.core.config import (
+    VECTOR_ANN_THRESHOLD,
+    VECTOR_ANN_KIND,
+    VECTOR_ANN_RETRAIN_GROWTH,
+    VECTOR_IVF_NPROBE,
+    VECTOR_HNSW_M,
+    VECTOR_HNSW_EF_SEARCH,
+    VECTOR_TAIL_MIN_ROWS,
+    VECTOR_TAIL_FRACTION,
+)
+
+# k-means only needs a sample, not the whole corpus
+TRAIN_POINTS_PER_LIST = 256
+
+
+# ===============================
+# INDEX TYPE HELPERS
+# ===============================
+def is_flat(index) -> bool:
+    return isinstance(index, faiss.IndexFlat)
+
+
+def ivf_nlist(n: int) -> int:
+    """
+    Number of IVF lists, ~4·sqrt(N) (FAISS guideline)
+    """
+    return max(1, min(65536, int(4 * math.sqrt(n))))
+
+
+def exact_search(vectors: np.ndarray, queries: np.ndarray, k: int):
+    """
+    Brute-force top-k over a small array, as (distances, rows).
+    Squared L2 like the FAISS indexes; rows are not sorted.
+    """
+    queries = np.asarray(queries, dtype="float32")
+    k = min(k, len(vectors))
+    distances = (
+        (queries ** 2).sum(axis=1)[:, None]
+        - 2 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)[None, :]
+    )
+    rows = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(distances, rows, axis=1), rows
+
+
+def configure_search(index):
+    """
+    Search-time knobs are not always restored from disk
+    """
+    if isinstance(index, faiss.IndexIVF):
+        index.nprobe = VECTOR_IVF_NPROBE
+    elif isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = VECTOR_HNSW_EF_SEARCH
+
+
+# ===============================
+# BUILD
+# ===============================
+def build_ann_index(
+    vectors: np.ndarray,
+    kind: str = VECTOR_ANN_KIND,
+) -> faiss.Index:
+    """
+    Build (and train) an ANN index holding `vectors`
+    """
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    n, dimension = vectors.shape
+
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, VECTOR_HNSW_M)
+        index.add(vectors)
+
+    elif kind == "ivf":
+        nlist = ivf_nlist(n)
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+
+        sample_size = min(n, nlist * TRAIN_POINTS_PER_LIST)
+        if sample_size < n:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(n, sample_size, replace=False)]
+        else:
+            sample = vectors
+
+        index.train(sample)
+        # Keep reconstruct() working so the index can be retrained later
+        index.set_direct_map_type(faiss.DirectMap.Array)
+        index.add(vectors)
+
+    else:
+        raise ValueError(f"Unsupported ANN index kind: {kind}")
+
+    configure_search(index)
+    return index
+
+
+# ===============================
+# POLICY
+# ===============================
+def tail_limit(index_size: int) -> int:
+    """
+    Rows the brute-force tail may hold before it is folded
+    into the index. Proportional to the index, so folding
+    (a full copy) stays amortized O(1) per vector.
+    """
+    return max(VECTOR_TAIL_MIN_ROWS, int(index_size * VECTOR_TAIL_FRACTION))
+
+
+def needs_rebuild(index, n: int, trained_size: int) -> bool:
+    """
+    Flat -> ANN once the partition (`n` rows, tail included)
+    crosses the threshold, then retrain whenever it has grown
+    enough that the original clustering is stale.
+    """
+
+    if n < VECTOR_ANN_THRESHOLD:
+        return False
+
+    if is_flat(index):
+        return True
+
+    # HNSW has no trained state to go stale
+    if isinstance(index, faiss.IndexHNSW):
+        return False
+
+    return n >= trained_size * VECTOR_ANN_RETRAIN_GROWTH
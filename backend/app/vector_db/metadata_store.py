@@ -0,0 +1,211 @@
+import json
+import mmap
+import os
+from array import array
+from typing import Dict, List
+
+import numpy as np
+
+# Sentinel for chunks without a chunk_index
+NO_CHUNK_INDEX = -1
+
+TEXT_FILE = "texts.bin"
+TEXT_OFFSETS_FILE = "text_offsets.bin"
+ID_FILE = "ids.bin"
+ID_OFFSETS_FILE = "id_offsets.bin"
+CHUNK_INDEX_FILE = "chunk_index.bin"
+META_REF_FILE = "meta_ref.bin"
+JOB_META_FILE = "job_meta.json"
+
+
+def _write_at(path: str, offset: int, data: bytes):
+    """
+    Truncate to `offset` then append, so bytes left over
+    from an interrupted write are overwritten, not kept
+    """
+    with open(path, "ab") as f:
+        f.truncate(offset)
+        f.write(data)
+
+
+def _map_bytes(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_array(path: str, dtype: str):
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class ChunkStore:
+    """
+    Columnar chunk metadata for one job partition.
+
+    - Job-level metadata (source, fileName, userId, ...) is
+      stored once and referenced by a small integer per chunk
+    - Chunk texts / ids live in one contiguous UTF-8 buffer
+      each, addressed by end offsets
+    - Per-chunk fields live in typed arrays
+
+    Row i matches FAISS vector i. Loaded stores are
+    memory-mapped and copied into memory on first append.
+    """
+
+    def __init__(self):
+        self.texts = bytearray()
+        self.text_offsets = array("q")  # end offset of row i
+        self.ids = bytearray()
+        self.id_offsets = array("q")
+        self.chunk_index = array("i")
+        self.meta_ref = array("i")
+
+        self.job_metadata: List[Dict] = []
+        self._meta_lookup: Dict[str, int] = {}
+        self._length = 0
+        self.mmapped = False
+
+    def __len__(self):
+        return self._length
+
+    # ---------------------------
+    # WRITE
+    # ---------------------------
+    def append(self, documents: List[Dict]):
+        self._materialize()
+
+        for doc in documents:
+            metadata = dict(doc.get("metadata") or {})
+            chunk_index = metadata.pop("chunk_index", NO_CHUNK_INDEX)
+
+            key = json.dumps(metadata, sort_keys=True, ensure_ascii=False)
+            ref = self._meta_lookup.get(key)
+            if ref is None:
+                ref = len(self.job_metadata)
+                self.job_metadata.append(metadata)
+                self._meta_lookup[key] = ref
+
+            self.texts += doc["text"].encode("utf-8")
+            self.text_offsets.append(len(self.texts))
+            self.ids += str(doc["id"]).encode("utf-8")
+            self.id_offsets.append(len(self.ids))
+            self.chunk_index.append(chunk_index)
+            self.meta_ref.append(ref)
+
+        self._length += len(documents)
+
+    def _materialize(self):
+        if not self.mmapped:
+            return
+
+        n = self._length
+        self.text_offsets = array("q", self.text_offsets[:n].tolist())
+        self.id_offsets = array("q", self.id_offsets[:n].tolist())
+        self.chunk_index = array("i", self.chunk_index[:n].tolist())
+        self.meta_ref = array("i", self.meta_ref[:n].tolist())
+
+        text_end = self.text_offsets[-1] if n else 0
+        id_end = self.id_offsets[-1] if n else 0
+        self.texts = bytearray(self.texts[:text_end])
+        self.ids = bytearray(self.ids[:id_end])
+
+        self.mmapped = False
+
+    # ---------------------------
+    # READ
+    # ---------------------------
+    @staticmethod
+    def _slice(buffer, offsets, i: int) -> str:
+        start = int(offsets[i - 1]) if i > 0 else 0
+        return bytes(buffer[start:int(offsets[i])]).decode("utf-8")
+
+    def text(self, i: int) -> str:
+        return self._slice(self.texts, self.text_offsets, i)
+
+    def get(self, i: int) -> Dict:
+        metadata = dict(self.job_metadata[int(self.meta_ref[i])])
+
+        chunk_index = int(self.chunk_index[i])
+        if chunk_index != NO_CHUNK_INDEX:
+            metadata["chunk_index"] = chunk_index
+
+        return {
+            "id": self._slice(self.ids, self.id_offsets, i),
+            "text": self.text(i),
+            "metadata": metadata,
+        }
+
+    # ---------------------------
+    # PERSISTENCE
+    # ---------------------------
+    def save_incremental(self, path: str, start: int):
+        """
+        Append rows [start:] to the on-disk columns.
+        Buffers are written before offsets so a crash never
+        leaves an offset pointing past the end of its buffer.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        text_start = self.text_offsets[start - 1] if start else 0
+        id_start = self.id_offsets[start - 1] if start else 0
+
+        _write_at(
+            os.path.join(path, TEXT_FILE), text_start,
+            bytes(self.texts[text_start:]),
+        )
+        _write_at(
+            os.path.join(path, ID_FILE), id_start,
+            bytes(self.ids[id_start:]),
+        )
+
+        for name, column in (
+            (TEXT_OFFSETS_FILE, self.text_offsets),
+            (ID_OFFSETS_FILE, self.id_offsets),
+            (CHUNK_INDEX_FILE, self.chunk_index),
+            (META_REF_FILE, self.meta_ref),
+        ):
+            _write_at(
+                os.path.join(path, name),
+                start * column.itemsize,
+                column[start:].tobytes(),
+            )
+
+        # Job-level metadata is tiny, rewrite it atomically
+        meta_path = os.path.join(path, JOB_META_FILE)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.job_metadata, f, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @classmethod
+    def load(cls, path: str, max_rows: int) -> "ChunkStore":
+        store = cls()
+
+        with open(os.path.join(path, JOB_META_FILE), encoding="utf-8") as f:
+            store.job_metadata = json.load(f)
+        store._meta_lookup = {
+            json.dumps(m, sort_keys=True, ensure_ascii=False): i
+            for i, m in enumerate(store.job_metadata)
+        }
+
+        store.texts = _map_bytes(os.path.join(path, TEXT_FILE))
+        store.ids = _map_bytes(os.path.join(path, ID_FILE))
+        store.text_offsets = _map_array(os.path.join(path, TEXT_OFFSETS_FILE), "int64")
+        store.id_offsets = _map_array(os.path.join(path, ID_OFFSETS_FILE), "int64")
+        store.chunk_index = _map_array(os.path.join(path, CHUNK_INDEX_FILE), "int32")
+        store.meta_ref = _map_array(os.path.join(path, META_REF_FILE), "int32")
+
+        # Columns may disagree after a crash mid-append
+        # -> keep only rows present everywhere (and in the index)
+        store._length = min(
+            max_rows,
+            len(store.text_offsets),
+            len(store.id_offsets),
+            len(store.chunk_index),
+            len(store.meta_ref),
+        )
+        store.mmapped = True
+
+        return store
@@ -0,0 +1,105 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, List
+
+import numpy as np
+
+
+class QueryEmbeddingBatcher:
+    """
+    Coalesces concurrent single-query encodes into one batch.
+
+    Chat requests run in threadpool threads; instead of each
+    thread calling SentenceTransformer.encode for one query
+    (and fighting over the GIL / torch threads), callers
+    enqueue and a single worker encodes whatever arrived
+    within `window_ms`, up to `max_batch` queries at a time.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        window_ms: float,
+        max_batch: int,
+    ):
+        self.encode = encode
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+        # metrics
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.queries = 0
+        self._recent_waits_ms = deque(maxlen=1000)
+
+    def embed(self, text: str) -> np.ndarray:
+        self._ensure_worker()
+
+        future: Future = Future()
+        self._queue.put((text, time.perf_counter(), future))
+        return future.result()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="query-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            started = time.perf_counter()
+            texts = [text for text, _, _ in batch]
+
+            try:
+                embeddings = self.encode(texts)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.queries += len(batch)
+                self._recent_waits_ms.extend(
+                    (started - enqueued) * 1000 for _, enqueued, _ in batch
+                )
+
+    def stats(self):
+        with self._stats_lock:
+            waits = np.array(self._recent_waits_ms or [0.0])
+            return {
+                "batches": self.batches,
+                "queries": self.queries,
+                "avgBatchSize": (
+                    round(self.queries / self.batches, 2)
+                    if self.batches else 0.0
+                ),
+                "queueWaitMsP50": round(float(np.percentile(waits, 50)), 2),
+                "queueWaitMsP99": round(float(np.percentile(waits, 99)), 2),
+            }
@@ -0,0 +1,116 @@
+"""
+PDF extraction benchmark: serial page loop vs the process pool.
+
+Builds a synthetic PDF (text pages + image-only "scanned" pages
+that need OCR) and times extraction with each worker count.
+
+Run from backend/:
+    python -m benchmarks.pdf_extract_bench
+    python -m benchmarks.pdf_extract_bench --pages 200 --scanned 1.0 --workers 2,4,8
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+from app.services.extractors.pdf_pages import extract_page_range, init_worker
+from app.services.extractors.pdf_service import extract_text_from_pdf
+
+PARAGRAPH = (
+    "Photosynthesis converts light energy into chemical energy. "
+    "Chlorophyll absorbs mostly blue and red light, and the energy "
+    "drives the synthesis of glucose from carbon dioxide and water. "
+)
+
+
+# ===============================
+# SYNTHETIC DOCUMENT
+# ===============================
+def make_pdf(pages: int, scanned: float) -> bytes:
+    """
+    `scanned` = fraction of pages that are images only
+    (rendered text, no text layer)
+    """
+    n_scanned = round(pages * scanned)
+    doc = fitz.open()
+
+    for page_num in range(pages):
+        source = fitz.open()
+        page = source.new_page()
+        page.insert_textbox(
+            fitz.Rect(50, 50, 545, 790),
+            f"Page {page_num + 1}\n\n" + PARAGRAPH * 12,
+            fontsize=11,
+        )
+
+        if page_num < n_scanned:
+            pix = page.get_pixmap(dpi=150)
+            image_page = doc.new_page(width=page.rect.width, height=page.rect.height)
+            image_page.insert_image(image_page.rect, pixmap=pix)
+        else:
+            doc.insert_pdf(source)
+        source.close()
+
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# ===============================
+# BENCHMARK
+# ===============================
+def run(pages: int, scanned: float, worker_counts):
+    pdf_bytes = make_pdf(pages, scanned)
+    print(
+        f"{pages} pages, {round(pages * scanned)} scanned, "
+        f"{len(pdf_bytes) / 1e6:.1f} MB\n"
+    )
+    print(f"{'mode':>10} {'seconds':>9} {'pages/s':>8} {'speedup':>8}")
+
+    started = time.perf_counter()
+    serial_pages = extract_page_range(pdf_bytes, 0, pages)
+    serial = time.perf_counter() - started
+    print(f"{'serial':>10} {serial:>9.2f} {pages / serial:>8.1f} {1.0:>8.2f}")
+
+    context = multiprocessing.get_context("spawn")
+    for workers in worker_counts:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=init_worker
+        ) as pool:
+            # Warm up: spawn the workers outside the timing
+            list(pool.map(abs, range(workers)))
+
+            started = time.perf_counter()
+            text = extract_text_from_pdf(pdf_bytes, pool=pool)
+            elapsed = time.perf_counter() - started
+
+        assert text == " ".join(
+            "\n\n".join(t for _, t in serial_pages).split()
+        ), "parallel output differs from serial"
+
+        print(
+            f"{f'{workers} proc':>10} {elapsed:>9.2f} "
+            f"{pages / elapsed:>8.1f} {serial / elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument(
+        "--scanned", type=float, default=0.5,
+        help="fraction of image-only pages (OCR)",
+    )
+    parser.add_argument(
+        "--workers", default="2,4", help="comma-separated pool sizes"
+    )
+    args = parser.parse_args()
+
+    run(
+        pages=args.pages,
+        scanned=args.scanned,
+        worker_counts=[int(w) for w in args.workers.split(",")],
+    )
@@ -0,0 +1,128 @@
+"""
+Recall / latency benchmark: ANN index tiers vs exact flat search.
+
+Run from backend/:
+    python -m benchmarks.vector_index_bench
+    python -m benchmarks.vector_index_bench --sizes 10000,100000 --kinds ivf
+"""
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from app.vector_db.index_policy import build_ann_index
+
+DIMENSION = 384  # all-MiniLM-L6-v2
+
+
+# ===============================
+# SYNTHETIC CORPUS
+# ===============================
+def make_corpus(n: int, n_queries: int, seed: int = 0):
+    """
+    Clustered unit vectors (closer to real sentence
+    embeddings than uniform noise)
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(16, n // 1000)
+    centers = rng.standard_normal((n_clusters, DIMENSION), dtype="float32")
+
+    def sample(count):
+        out = np.empty((count, DIMENSION), dtype="float32")
+        # Generate in blocks to keep peak memory down at 5M
+        for start in range(0, count, 100_000):
+            end = min(count, start + 100_000)
+            labels = rng.integers(0, n_clusters, end - start)
+            block = centers[labels] + 0.5 * rng.standard_normal(
+                (end - start, DIMENSION), dtype="float32"
+            )
+            faiss.normalize_L2(block)
+            out[start:end] = block
+        return out
+
+    return sample(n), sample(n_queries)
+
+
+# ===============================
+# MEASUREMENT
+# ===============================
+def query_latencies(index, queries: np.ndarray, k: int):
+    """
+    One query at a time, like the chat path
+    """
+    latencies = []
+    results = np.empty((len(queries), k), dtype="int64")
+
+    for i, q in enumerate(queries):
+        start = time.perf_counter()
+        _, idx = index.search(q.reshape(1, -1), k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results[i] = idx[0]
+
+    return np.array(latencies), results
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(
+        len(set(t) & set(f))
+        for t, f in zip(truth, found)
+    )
+    return hits / (len(truth) * k)
+
+
+def run(sizes, kinds, n_queries: int, k: int):
+    print(
+        f"{'N':>9} {'index':>6} {'build s':>8} "
+        f"{'recall@' + str(k):>9} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+
+    for n in sizes:
+        vectors, queries = make_corpus(n, n_queries)
+
+        flat = faiss.IndexFlatL2(DIMENSION)
+        flat.add(vectors)
+
+        flat_lat, truth = query_latencies(flat, queries, k)
+        print(
+            f"{n:>9} {'flat':>6} {0:>8.1f} {1:>9.3f} "
+            f"{np.percentile(flat_lat, 50):>8.2f} "
+            f"{np.percentile(flat_lat, 99):>8.2f}"
+        )
+        del flat
+
+        for kind in kinds:
+            start = time.perf_counter()
+            index = build_ann_index(vectors, kind)
+            build_s = time.perf_counter() - start
+
+            lat, found = query_latencies(index, queries, k)
+            print(
+                f"{n:>9} {kind:>6} {build_s:>8.1f} "
+                f"{recall_at_k(truth, found):>9.3f} "
+                f"{np.percentile(lat, 50):>8.2f} "
+                f"{np.percentile(lat, 99):>8.2f}"
+            )
+            del index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,1000000,5000000",
+        help="comma-separated corpus sizes",
+    )
+    parser.add_argument("--kinds", default="ivf,hnsw")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    run(
+        sizes=[int(s) for s in args.sizes.split(",")],
+        kinds=args.kinds.split(","),
+        n_queries=args.queries,
+        k=args.k,
+    )
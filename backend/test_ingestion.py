@@ -20,7 +20,7 @@ async def run_test():
 
     # 🔎 Verify data exists in vector DB
     print("\n--- VECTOR DB TEST QUERY ---")
-    results = vector_db.search("orange", top_k=3)
+    results = vector_db.search(job_id, "orange", top_k=3)
 
     for i, r in enumerate(results):
         print(f"\nResult {i + 1}:")